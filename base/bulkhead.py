@@ -0,0 +1,99 @@
+"""
+Per-platform bulkheads
+Bound concurrent upstream searches so one busy platform cannot starve the others
+"""
+from typing import Any, Dict
+from contextlib import asynccontextmanager
+import asyncio
+import math
+from config import config
+from .errors import BulkheadFullError
+
+
+class Bulkhead:
+    """
+    Concurrency limit with a bounded, time-limited wait queue
+
+    Up to max_concurrent calls run at once and up to max_queue more wait for a
+    slot. A full queue is rejected right away (429); a call that waits longer
+    than queue_timeout is rejected (503). Both carry a Retry-After hint.
+    """
+
+    def __init__(self, name: str, max_concurrent: int = None, max_queue: int = None,
+                 queue_timeout: float = None):
+        self.name = name
+        self.max_concurrent = max_concurrent or config.BULKHEAD_MAX_CONCURRENT
+        self.max_queue = max_queue if max_queue is not None else config.BULKHEAD_MAX_QUEUE
+        self.queue_timeout = queue_timeout or config.BULKHEAD_QUEUE_TIMEOUT
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_timeout))
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Hold a slot for the duration of the block"""
+        if not self._semaphore.locked():
+            # Free slot - acquired without suspending
+            await self._semaphore.acquire()
+        else:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise BulkheadFullError(
+                    f"{self.name} is at capacity ({self.active} in flight, {self.waiting} queued)",
+                    status_code=429,
+                    retry_after=self.retry_after
+                )
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise BulkheadFullError(
+                    f"{self.name} queue wait exceeded {self.queue_timeout}s",
+                    status_code=503,
+                    retry_after=self.retry_after
+                )
+            finally:
+                self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Occupancy for monitoring"""
+        return {
+            "active": self.active,
+            "max_concurrent": self.max_concurrent,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected
+        }
+
+
+class BulkheadRegistry:
+    """Bulkheads keyed by platform name"""
+
+    def __init__(self):
+        self._bulkheads: Dict[str, Bulkhead] = {}
+
+    def get(self, name: str, **settings) -> Bulkhead:
+        bulkhead = self._bulkheads.get(name)
+        if bulkhead is None:
+            bulkhead = self._bulkheads[name] = Bulkhead(name, **settings)
+        return bulkhead
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: bulkhead.snapshot() for name, bulkhead in self._bulkheads.items()}
+
+
+# Global bulkhead registry
+bulkheads = BulkheadRegistry()
@@ -0,0 +1,186 @@
+"""
+Two-tier cache for platform search responses
+In-process TTL/LRU tier backed by an optional persistent SQLite tier,
+keyed by platform name plus the normalized, validated search parameters
+"""
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from pydantic import BaseModel
+from config import config
+from .models import TenderResponse
+from .disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the serialized TenderResponse layout changes so old disk entries are not read back
+CACHE_FORMAT_VERSION = 3
+
+
+class CacheEntry:
+    """
+    Serialized response with its expiry
+
+    ttl is the soft TTL: older entries are stale and only served in
+    stale-while-revalidate mode. Past ttl + max_stale (the hard TTL) they are dropped.
+    """
+    __slots__ = ("payload", "created_at", "ttl", "max_stale")
+
+    def __init__(self, payload: str, created_at: float, ttl: float, max_stale: float = 0):
+        self.payload = payload
+        self.created_at = created_at
+        self.ttl = ttl
+        self.max_stale = max_stale
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    @property
+    def is_stale(self) -> bool:
+        return self.age >= self.ttl
+
+    @property
+    def is_expired(self) -> bool:
+        return self.age >= self.ttl + self.max_stale
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+
+class ResponseCache:
+    """
+    Memory-bounded LRU cache of TenderResponse payloads
+
+    Responses are stored as JSON so every hit returns an independent copy and
+    the memory bound (CACHE_MAX_BYTES) reflects the real payload size.
+    Memory misses fall through to the disk tier, and hits there are promoted
+    back into memory, so a restarted process starts warm.
+    """
+
+    def __init__(self, max_bytes: int = None, max_entries: int = None,
+                 disk: Optional[DiskCache] = None):
+        self.max_bytes = max_bytes or config.CACHE_MAX_BYTES
+        self.max_entries = max_entries or config.CACHE_MAX_ENTRIES
+        self.disk = disk
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.disk_errors = 0
+
+    @staticmethod
+    def make_key(platform_name: str, search_request: BaseModel) -> str:
+        """Cache key from platform name and normalized search parameters"""
+        params = json.dumps(search_request.model_dump(mode="json", exclude_none=True), sort_keys=True)
+        digest = hashlib.sha256(params.encode()).hexdigest()[:32]
+        return f"{platform_name}:v{CACHE_FORMAT_VERSION}:{digest}"
+
+    async def lookup(self, key: str, allow_stale: bool = False) -> Optional[Tuple[TenderResponse, CacheEntry]]:
+        """
+        Return a cached response and its entry from memory or disk, or None
+
+        Args:
+            key: Cache key
+            allow_stale: Also return entries past their soft TTL (but within the hard TTL)
+        """
+        entry = self._get_entry(key)
+        if entry is None and self.disk is not None:
+            entry = await self._load_from_disk(key)
+        if entry is None or (entry.is_stale and not allow_stale):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return TenderResponse.model_validate_json(entry.payload), entry
+
+    async def store(self, key: str, response: TenderResponse, ttl: float, max_stale: float = None):
+        """Store a response (without its per-request metadata) in memory and on disk"""
+        if ttl <= 0:
+            return
+        if max_stale is None:
+            max_stale = config.CACHE_MAX_STALE
+        entry = CacheEntry(response.model_dump_json(exclude={"metadata"}, exclude_unset=True), time.time(), ttl, max_stale)
+        self._put_entry(key, entry)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(
+                    self.disk.set, key, entry.payload, entry.created_at, entry.ttl, entry.max_stale
+                )
+            except Exception as e:
+                self.disk_errors += 1
+                logger.warning(f"Disk cache write failed for {key}: {e}")
+
+    def _get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Memory tier lookup (drops entries past the hard TTL)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.is_expired:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put_entry(self, key: str, entry: CacheEntry):
+        if entry.size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._evict()
+
+    async def _load_from_disk(self, key: str) -> Optional[CacheEntry]:
+        """Disk tier lookup, promoting hits into memory"""
+        try:
+            row = await asyncio.to_thread(self.disk.get, key)
+        except Exception as e:
+            self.disk_errors += 1
+            logger.warning(f"Disk cache read failed for {key}: {e}")
+            return None
+        if row is None:
+            return None
+        entry = CacheEntry(*row)
+        self.disk_hits += 1
+        self._put_entry(key, entry)
+        return entry
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _evict(self):
+        """Drop least recently used entries until within bounds"""
+        while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            key = next(iter(self._entries))
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_enabled": self.disk is not None,
+            "disk_hits": self.disk_hits,
+            "disk_errors": self.disk_errors
+        }
+
+
+# Global response cache instance
+response_cache = ResponseCache(disk=DiskCache() if config.CACHE_DISK_ENABLED else None)
@@ -0,0 +1,119 @@
+"""
+Per-platform circuit breakers
+Fail fast while an upstream platform is down and probe it again after a cool-down
+"""
+from typing import Any, Dict, Optional
+from enum import Enum
+import time
+from config import config
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker
+
+    closed: requests pass; consecutive failures are counted
+    open: requests are rejected until recovery_timeout has passed
+    half_open: up to half_open_max_calls probes pass; a success closes the
+    circuit, a failure opens it again
+    """
+
+    def __init__(self, name: str, failure_threshold: int = None,
+                 recovery_timeout: float = None, half_open_max_calls: int = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or config.CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or config.CIRCUIT_RECOVERY_TIMEOUT
+        self.half_open_max_calls = half_open_max_calls or config.CIRCUIT_HALF_OPEN_MAX_CALLS
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open_calls = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self.retry_after == 0:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go upstream (reserves a probe slot when half-open)"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        return False
+
+    def record_success(self):
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._half_open_calls = 0
+
+    def record_failure(self, error: str = None):
+        self._last_error = error
+        if self._state == CircuitState.OPEN:
+            return
+        if self._state == CircuitState.HALF_OPEN:
+            self._open()
+            return
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._open()
+
+    def release(self):
+        """Give back a probe slot for a call that neither succeeded nor failed upstream"""
+        if self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def _open(self):
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._half_open_calls = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for /health and /platforms"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_after": round(self.retry_after, 1),
+            "last_error": self._last_error
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by platform name"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str, **settings) -> CircuitBreaker:
+        """Get (or create) the breaker for a platform"""
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name, **settings)
+        return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.snapshot() for name, breaker in self._breakers.items()}
+
+
+# Global circuit breaker registry
+circuit_breakers = CircuitBreakerRegistry()
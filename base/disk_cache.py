@@ -0,0 +1,131 @@
+"""
+Persistent SQLite second-tier cache
+Survives restarts and is shared by all uvicorn workers on the same host
+"""
+from typing import Any, Dict, Optional, Tuple
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from config import config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    ttl REAL NOT NULL,
+    max_stale REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries (expires_at);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_created_at ON cache_entries (created_at);
+"""
+
+
+class DiskCache:
+    """
+    Key/value store of zlib-compressed payloads with TTL and size-based eviction
+
+    WAL mode and a busy timeout let several processes read and write the same
+    file. Methods are blocking - call them through asyncio.to_thread.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = None, evict_interval: float = 60.0):
+        self.path = path or config.CACHE_DISK_PATH
+        self.max_bytes = max_bytes or config.CACHE_DISK_MAX_BYTES
+        self.evict_interval = evict_interval
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._last_evict = 0.0
+        self._schema_ready = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            with self._lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float, float, float]]:
+        """
+        Read an unexpired entry
+
+        Returns:
+            (payload, created_at, ttl, max_stale) or None
+        """
+        row = self._connection().execute(
+            "SELECT payload, created_at, ttl, max_stale FROM cache_entries WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        payload, created_at, ttl, max_stale = row
+        return zlib.decompress(payload).decode(), created_at, ttl, max_stale
+
+    def set(self, key: str, payload: str, created_at: float, ttl: float, max_stale: float):
+        """Write (or replace) an entry"""
+        blob = zlib.compress(payload.encode(), 6)
+        if len(blob) > self.max_bytes:
+            return
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, payload, size, created_at, ttl, max_stale, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, blob, len(blob), created_at, ttl, max_stale, created_at + ttl + max_stale)
+        )
+        if time.monotonic() - self._last_evict > self.evict_interval:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the oldest ones until within max_bytes"""
+        self._last_evict = time.monotonic()
+        conn = self._connection()
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale_keys = []
+        for key, size in conn.execute("SELECT key, size FROM cache_entries ORDER BY created_at"):
+            stale_keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", stale_keys)
+        logger.info(f"Disk cache evicted {len(stale_keys)} entries ({freed} bytes)")
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+        return {"path": self.path, "entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def close(self):
+        """Close connections opened by all threads"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
@@ -0,0 +1,24 @@
+"""
+Exceptions shared by platform helpers
+"""
+from typing import Optional
+
+
+class PlatformRequestError(Exception):
+    """Upstream request failed (keeps HTTP status and Retry-After when known)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retry_after: Optional[float] = None, cause: Optional[Exception] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.cause = cause
+
+
+class BulkheadFullError(Exception):
+    """Platform bulkhead rejected the call (queue full or queue wait timed out)"""
+
+    def __init__(self, message: str, status_code: int = 503, retry_after: float = 1.0):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
@@ -0,0 +1,95 @@
+"""
+Hedged requests for API platforms
+If an attempt is slower than a learned latency percentile, send a second
+identical request and take whichever answers first
+"""
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+from collections import deque
+import asyncio
+from config import config
+from .retry import RetryBudget
+
+
+class HedgePolicy:
+    """Per-platform hedging settings (opt-in)"""
+
+    def __init__(self, enabled: bool = False, percentile: float = None,
+                 max_ratio: float = None, min_samples: int = None, min_delay: float = 0.05):
+        self.enabled = enabled
+        self.percentile = percentile or config.HEDGE_PERCENTILE
+        self.max_ratio = max_ratio if max_ratio is not None else config.HEDGE_MAX_RATIO
+        self.min_samples = min_samples or config.HEDGE_MIN_SAMPLES
+        self.min_delay = min_delay
+
+
+class LatencyTracker:
+    """Recent request latencies of one platform"""
+
+    def __init__(self, window: int = None):
+        self._samples: Deque[float] = deque(maxlen=window or config.HEDGE_LATENCY_WINDOW)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, p: float, min_samples: int = 1) -> Optional[float]:
+        """Latency at percentile p (0-1), or None without enough samples"""
+        if len(self._samples) < min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+latency_trackers: Dict[str, LatencyTracker] = {}
+hedge_budgets: Dict[str, RetryBudget] = {}
+
+
+def get_latency_tracker(platform_name: str) -> LatencyTracker:
+    tracker = latency_trackers.get(platform_name)
+    if tracker is None:
+        tracker = latency_trackers[platform_name] = LatencyTracker()
+    return tracker
+
+
+def get_hedge_budget(platform_name: str, policy: HedgePolicy) -> RetryBudget:
+    """Hedges draw on a budget capped at max_ratio of recent requests"""
+    budget = hedge_budgets.get(platform_name)
+    if budget is None:
+        budget = hedge_budgets[platform_name] = RetryBudget(ratio=policy.max_ratio, min_retries=0)
+    return budget
+
+
+async def hedged_call(call: Callable[[], Awaitable[Any]], delay: float,
+                      budget: RetryBudget) -> Tuple[Any, bool]:
+    """
+    Run call(), starting one identical backup call if the first takes longer than delay
+
+    The first successful result wins and the other call is cancelled. If one
+    call fails the other is still awaited; if both fail the first error is raised.
+
+    Returns:
+        (result, hedged) where hedged is True when a backup call was sent
+    """
+    first = asyncio.ensure_future(call())
+    tasks = [first]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done or not budget.try_acquire():
+            return await first, False
+
+        tasks.append(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        first_error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), True
+                first_error = first_error or task.exception()
+        raise first_error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
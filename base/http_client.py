@@ -0,0 +1,95 @@
+"""
+Shared pooled HTTP clients for platform requests
+One httpx.AsyncClient per platform so connections (DNS, TCP, TLS) are reused
+"""
+from typing import Any, Dict, Iterable, Optional
+import logging
+import httpx
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 support in httpx needs the optional 'h2' package"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClientPool:
+    """
+    Registry of long-lived httpx.AsyncClient instances keyed by platform
+
+    Clients are opened in the FastAPI lifespan and closed at shutdown.
+    Outside of the app (scripts, tests) clients are created lazily on first use.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def default_settings(self) -> Dict[str, Any]:
+        """Client settings from application configuration"""
+        return {
+            "timeout": config.HTTP_TIMEOUT,
+            "max_connections": config.HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "keepalive_expiry": config.HTTP_KEEPALIVE_EXPIRY,
+            "http2": config.HTTP_ENABLE_HTTP2,
+        }
+
+    def _create_client(self, key: str, settings: Dict[str, Any]) -> httpx.AsyncClient:
+        """Build a pooled client from settings"""
+        http2 = settings["http2"]
+        if http2 and not _http2_available():
+            logger.warning(f"HTTP/2 requested for {key} but 'h2' is not installed - using HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings["max_connections"],
+            max_keepalive_connections=settings["max_keepalive_connections"],
+            keepalive_expiry=settings["keepalive_expiry"],
+        )
+        logger.info(f"Opening pooled HTTP client for {key} (http2={http2})")
+        return httpx.AsyncClient(timeout=settings["timeout"], limits=limits, http2=http2)
+
+    def get_client(self, key: str, settings: Optional[Dict[str, Any]] = None) -> httpx.AsyncClient:
+        """
+        Get (or create) the pooled client for a platform
+
+        Args:
+            key: Platform name the client belongs to
+            settings: Overrides for the default client settings
+
+        Returns:
+            Shared httpx.AsyncClient
+        """
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._create_client(key, self.default_settings() | (settings or {}))
+            self._clients[key] = client
+        return client
+
+    def open(self, platforms: Iterable[Any]):
+        """Open clients for platform instances ahead of the first request"""
+        for platform in platforms:
+            self.get_client(platform.platform_name, platform.get_http_client_settings())
+
+    async def aclose(self):
+        """Close all pooled clients"""
+        clients, self._clients = self._clients, {}
+        for key, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Failed to close HTTP client for {key}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Open clients for monitoring"""
+        return {key: {"closed": client.is_closed} for key, client in self._clients.items()}
+
+
+# Global client pool instance
+client_pool = HTTPClientPool()
@@ -0,0 +1,160 @@
+"""
+Declarative field mapping from upstream records to TenderRecord
+Each platform declares once which source key (or function) feeds each Tender
+field. The mapper is compiled when the platform module is imported, so mapping
+a record is a flat loop with type coercion done exactly once.
+"""
+from typing import Any, Callable, Dict, List, Optional, Union, get_args
+from datetime import date, datetime
+import re
+from .models import RESULT_KEYS, Tender, TenderRecord
+
+# Returned by a source function to leave the field out entirely
+OMIT = object()
+
+Source = Union[str, Callable[[Dict[str, Any]], Any]]
+
+DATE_FORMATS = ("%m/%d/%Y", "%m-%d-%Y", "%Y%m%d")
+NUMBER = re.compile(r'-?\d[\d,]*(?:\.\d+)?')
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    ISO date/datetime, MM/DD/YYYY, MM-DD-YYYY or YYYYMMDD; None if unparseable
+    A zone offset (on a datetime or a bare date) is kept, giving an aware datetime
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    text = str(value).strip()
+    if len(text) > 10 and text[10] in "+-Z":
+        # Date with a zone suffix, e.g. TED "2024-01-05+01:00": midnight in that zone (aware)
+        # fromisoformat would read the suffix as a time, so spell the midnight out
+        zone = "+00:00" if text[10:] == "Z" else text[10:]
+        text = f"{text[:10]}T00:00:00{zone}"
+    elif text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_float(value: Any) -> Optional[float]:
+    """Numbers, numeric strings ("$1,200.50") or {"amount": ...} objects; None otherwise"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return parse_float(value.get("amount", value.get("value")))
+    match = NUMBER.search(str(value))
+    return float(match.group().replace(",", "")) if match else None
+
+
+def to_str(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _coercer(field_name: str) -> Callable[[Any], Any]:
+    """Coercion for a Tender field, chosen from its annotation"""
+    field = Tender.model_fields[field_name]
+    types = get_args(field.annotation) or (field.annotation,)
+    if datetime in types:
+        return parse_datetime
+    if float in types:
+        return parse_float
+    if str in types:
+        if field.is_required():
+            return lambda value: to_str(value) or ""
+        return to_str
+    return lambda value: value
+
+
+def _getter(source: Source) -> Callable[[Dict[str, Any]], Any]:
+    if callable(source):
+        return source
+    if "." in source:
+        path = source.split(".")
+        
+        def get_path(record: Dict[str, Any]) -> Any:
+            for key in path:
+                if not isinstance(record, dict):
+                    return None
+                record = record.get(key)
+            return record
+        return get_path
+    return lambda record: record.get(source)
+
+
+class FieldMapper:
+    """
+    Compiled mapping of one platform's upstream records to TenderRecord
+    
+    Args:
+        platform: Platform name (used to register result_keys)
+        fields: Tender field -> source key, dotted path or function(record)
+        extra: Tender.extra key -> source, for platform-specific data
+        result_keys: Tender field -> key used in the platform's legacy results dicts
+        keep_unmapped: Copy source keys not used by any mapping into extra
+    """
+    
+    def __init__(self, platform: str, fields: Dict[str, Source], extra: Dict[str, Source] = None,
+                 result_keys: Dict[str, str] = None, keep_unmapped: bool = False):
+        unknown = set(fields) - set(Tender.model_fields)
+        if unknown:
+            raise ValueError(f"{platform} mapper targets unknown Tender fields: {sorted(unknown)}")
+        missing = {name for name, field in Tender.model_fields.items() if field.is_required()} - set(fields)
+        if missing:
+            raise ValueError(f"{platform} mapper does not map required Tender fields: {sorted(missing)}")
+        self.platform = platform
+        # Plain keys are read straight off the record; paths and functions go through a getter
+        self._keyed = [(name, source, _coercer(name)) for name, source in fields.items()
+                       if isinstance(source, str) and "." not in source]
+        self._fields = [(name, _getter(source), _coercer(name)) for name, source in fields.items()
+                        if callable(source) or "." in source]
+        # Fields the source provides, shared by every record this mapper builds
+        self._mapped = frozenset(fields)
+        self._extra = [(name, _getter(source)) for name, source in (extra or {}).items()]
+        self._keep_unmapped = keep_unmapped
+        self._mapped_sources = {source for source in list(fields.values()) + list((extra or {}).values())
+                                if isinstance(source, str)} | set(extra or {})
+        RESULT_KEYS[platform] = dict(result_keys or {})
+    
+    def map(self, record: Dict[str, Any]) -> TenderRecord:
+        """Build a TenderRecord from one upstream record (no validation pass)"""
+        values = {}
+        mapped = self._mapped
+        get = record.get
+        for name, key, coerce in self._keyed:
+            values[name] = coerce(get(key))
+        for name, source, coerce in self._fields:
+            value = source(record)
+            if value is OMIT:
+                mapped = mapped - {name}
+            else:
+                values[name] = coerce(value)
+        extra = {}
+        for name, source in self._extra:
+            value = source(record)
+            if value is not OMIT:
+                extra[name] = value
+        if self._keep_unmapped:
+            for key, value in record.items():
+                if key not in self._mapped_sources:
+                    extra[key] = value
+        return TenderRecord(**values, extra=extra, mapped=mapped)
+    
+    def map_all(self, records: List[Dict[str, Any]]) -> List[TenderRecord]:
+        return [self.map(record) for record in records]
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, model_serializer
+from typing import Optional, List, Dict, Any, FrozenSet
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
@@ -23,20 +24,145 @@ class Tender(BaseModel):
     category: Optional[str] = None
     type: Optional[str] = None
     status: Optional[str] = None
+    extra: Dict[str, Any] = Field(default_factory=dict)  # Platform-specific fields (cpv_codes, award, ...)
+    
+    @classmethod
+    def from_result(cls, item: Dict[str, Any]) -> "Tender":
+        """Build a tender from a platform result dict, keeping unknown keys in extra"""
+        core = {key: value for key, value in item.items() if key in TENDER_FIELDS}
+        extra = {key: value for key, value in item.items() if key not in TENDER_FIELDS}
+        return cls(**core, extra=extra)
+    
+    def as_result(self, result_keys: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Backward-compatible result dict (fields that were set, plus extra)
+        
+        result_keys renames Tender fields to a platform's legacy keys
+        (e.g. posted_date -> publication_date for TED).
+        """
+        result = self.model_dump(exclude_unset=True, exclude={"extra"})
+        for field, key in (result_keys or {}).items():
+            if field in result:
+                result[key] = result.pop(field)
+        result.update(self.extra)
+        return result
+
+TENDER_FIELDS = set(Tender.model_fields) - {"extra"}
+# Tender field order, used when dumping records
+TENDER_FIELD_ORDER = tuple(name for name in Tender.model_fields if name != "extra")
+
+@dataclass(slots=True)
+class TenderRecord:
+    """
+    Slotted tender used inside the pipeline (mapping, sharding, streaming, storage)
+    
+    Same fields as Tender, already coerced by the platform's FieldMapper, at a
+    fraction of a pydantic model's size and build cost. Records become Tender
+    models only when a TenderResponse is serialized.
+    """
+    title: str
+    id: Optional[str] = None
+    description: Optional[str] = None
+    organization: Optional[str] = None
+    url: Optional[str] = None
+    notice_id: Optional[str] = None
+    posted_date: Optional[datetime] = None
+    response_deadline: Optional[datetime] = None
+    estimated_value: Optional[float] = None
+    currency: Optional[str] = None
+    category: Optional[str] = None
+    type: Optional[str] = None
+    status: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    mapped: FrozenSet[str] = frozenset(TENDER_FIELD_ORDER)  # Fields the source provided (shared per mapper)
+    
+    @classmethod
+    def from_tender(cls, tender: Tender) -> "TenderRecord":
+        values = {name: getattr(tender, name) for name in TENDER_FIELD_ORDER}
+        return cls(**values, extra=tender.extra, mapped=frozenset(tender.model_fields_set) - {"extra"})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Tender-shaped dict (every field, plus extra)"""
+        result = {name: getattr(self, name) for name in TENDER_FIELD_ORDER}
+        result["extra"] = self.extra
+        return result
+    
+    def as_result(self, result_keys: Dict[str, str] = None) -> Dict[str, Any]:
+        """Backward-compatible result dict - same layout as Tender.as_result"""
+        result = {name: getattr(self, name) for name in TENDER_FIELD_ORDER if name in self.mapped}
+        for field_name, key in (result_keys or {}).items():
+            if field_name in result:
+                result[key] = result.pop(field_name)
+        result.update(self.extra)
+        return result
+
+TENDER_LIST = TypeAdapter(List[Tender])
+
+# Platform name -> {Tender field: legacy results key}, registered by field mappers
+RESULT_KEYS: Dict[str, Dict[str, str]] = {}
 
 class TenderResponse(BaseModel):
     """Response model for tender search results"""
     platform: str
     total_count: int
     tenders: List[Tender] = Field(default_factory=list)
-    results: Optional[List[Dict[str, Any]]] = Field(default_factory=list)  # Backward compatibility
+    # Backward-compatible dict view of tenders - only filled when a client asks (include_results)
+    results: Optional[List[Dict[str, Any]]] = None
     query_info: Dict[str, Any] = Field(default_factory=dict)
     status: str = "success"
     error: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
     
+    # Records the tenders are built from when the response is serialized (see from_records)
+    _records: Optional[List[TenderRecord]] = PrivateAttr(default=None)
+    
     def __init__(self, **data):
+        # Platforms pass results dicts; tenders is the single stored representation
+        results = data.pop("results", None)
+        if results and not data.get("tenders"):
+            data["tenders"] = [Tender.from_result(item) if isinstance(item, dict) else item for item in results]
         super().__init__(**data)
-        # Ensure backward compatibility - if results provided but not tenders, convert
-        if self.results and not self.tenders:
-            self.tenders = [Tender(**item) if isinstance(item, dict) else item for item in self.results]
\ No newline at end of file
+    
+    @classmethod
+    def from_records(cls, records: List[TenderRecord], **data) -> "TenderResponse":
+        """
+        Response holding TenderRecords; tenders stays empty until serialization
+        
+        Internal consumers (storage, streaming, the results view) read .records,
+        so Tender models are validated once, at the API boundary.
+        """
+        response = cls(**data)
+        response._records = records
+        return response
+    
+    @property
+    def records(self) -> List[TenderRecord]:
+        """Tenders as records, whichever form the response holds"""
+        if self._records is None:
+            self._records = [TenderRecord.from_tender(tender) for tender in self.tenders]
+        return self._records
+    
+    def materialize(self) -> "TenderResponse":
+        """Build the Tender models from records (no-op once built)"""
+        if self._records and not self.tenders:
+            tenders = TENDER_LIST.validate_python(self._records, from_attributes=True)
+            # Keep which fields the source provided, so cached copies give the same results view
+            for tender, record in zip(tenders, self._records):
+                object.__setattr__(tender, "__pydantic_fields_set__", set(record.mapped) | {"extra"})
+            self.tenders = tenders
+        return self
+    
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler):
+        self.materialize()
+        return handler(self)
+    
+    def results_view(self) -> List[Dict[str, Any]]:
+        """Result dicts as platforms produced them, built on demand"""
+        result_keys = RESULT_KEYS.get(self.platform)
+        return [record.as_result(result_keys) for record in self.records]
+    
+    def with_results(self) -> "TenderResponse":
+        """Fill results for clients that still read the old field"""
+        self.results = self.results_view()
+        return self
\ No newline at end of file
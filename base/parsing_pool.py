@@ -0,0 +1,99 @@
+"""
+Executor for CPU-bound HTML parsing
+Keeps BeautifulSoup work off the event loop so API platforms are not stalled
+by a large scraped page
+"""
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import functools
+import logging
+from config import config
+
+logger = logging.getLogger(__name__)
+
+POOL_KINDS = ("process", "thread", "inline")
+
+
+def warm_up() -> bool:
+    """Import and exercise the parser stack once in a worker"""
+    from bs4 import BeautifulSoup
+    try:
+        BeautifulSoup("<div class='warm-up'><p>ok</p></div>", "lxml")
+    except Exception:
+        BeautifulSoup("<div class='warm-up'><p>ok</p></div>", "html.parser")
+    return True
+
+
+class ParsingPool:
+    """
+    Runs parse functions in a process pool, a thread pool or inline
+
+    Functions given to run() must be module-level (picklable) and should take
+    HTML bytes plus plain values and return plain dicts/lists, so the same code
+    works for every pool kind. A crashed process pool is replaced and the call
+    is retried inline.
+    """
+
+    def __init__(self, kind: str = None, size: int = None):
+        self.kind = (kind or config.PARSE_POOL_KIND).lower()
+        if self.kind not in POOL_KINDS:
+            raise ValueError(f"PARSE_POOL_KIND must be one of {POOL_KINDS}, got {self.kind!r}")
+        self.size = size or config.PARSE_POOL_SIZE
+        self._executor: Optional[Executor] = None
+        self._tasks = 0
+        self._restarts = 0
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.kind == "inline":
+            return None
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.size)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="html-parse")
+            logger.info(f"Started {self.kind} parsing pool with {self.size} workers")
+        return self._executor
+
+    async def start(self):
+        """Create the workers and warm them up (imports, parser initialization)"""
+        executor = self._get_executor()
+        if executor is None:
+            warm_up()
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, warm_up) for _ in range(self.size)))
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) in the pool and await its result"""
+        self._tasks += 1
+        executor = self._get_executor()
+        if executor is None:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+        except BrokenExecutor as e:
+            logger.error(f"Parsing pool broken ({e}), restarting it and parsing inline")
+            self._restarts += 1
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            return fn(*args, **kwargs)
+
+    def shutdown(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "size": self.size,
+            "started": self._executor is not None or self.kind == "inline",
+            "tasks": self._tasks,
+            "restarts": self._restarts
+        }
+
+
+# Global parsing pool
+parsing_pool = ParsingPool()
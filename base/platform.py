@@ -1,10 +1,22 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Type
+from pydantic import BaseModel, ValidationError
 import httpx
 from bs4 import BeautifulSoup
 import asyncio
 import re
-from .models import TenderResponse
+import time
+from .models import TenderRecord, TenderResponse
+from .http_client import client_pool
+from .rate_limit import rate_limiter
+from .errors import PlatformRequestError
+from .retry import RetryPolicy, IDEMPOTENT_METHODS, get_retry_budget, to_request_error
+from .circuit_breaker import CircuitBreaker, circuit_breakers
+from .bulkhead import Bulkhead, bulkheads
+from .hedging import HedgePolicy, get_hedge_budget, get_latency_tracker, hedged_call
+from .cache import response_cache
+from .singleflight import search_flights
+from config import config as app_config
 
 class BasePlatform(ABC):
     """Base class za vse tender platforme"""
@@ -14,6 +26,8 @@ class BasePlatform(ABC):
         self.platform_name = self.get_platform_name()
         self.base_url = self.get_base_url()
         self.requires_auth = self.get_auth_requirements()
+        # Upstream request counters for this search, reported in response metadata
+        self.request_stats = {"attempts": 0, "retries": 0, "retry_time": 0.0, "hedges": 0}
         
     @abstractmethod
     def get_platform_name(self) -> str:
@@ -30,6 +44,59 @@ class BasePlatform(ABC):
         """Main search method - implement per platform"""
         pass
     
+    async def stream(self, max_records: Optional[int] = None, **kwargs) -> AsyncIterator[TenderRecord]:
+        """
+        Yield tenders one at a time - override to page through the upstream lazily
+        
+        The default adapter runs run_search() and yields its tenders, so platforms
+        without a paginated implementation still work (holding one page in memory)
+        and keep the cache, coalescing, bulkhead and circuit breaker.
+        """
+        response = await self.run_search(**kwargs)
+        if response.status == "circuit_open":
+            raise PlatformRequestError(response.error, status_code=503,
+                                       retry_after=self.circuit_breaker.retry_after)
+        if response.status == "error":
+            raise PlatformRequestError(response.error or f"{self.platform_name} search failed")
+        records = response.records
+        del response
+        for record in records[:max_records]:
+            yield record
+    
+    def run_stream(self, max_records: Optional[int] = None, **kwargs) -> AsyncIterator[TenderRecord]:
+        """
+        Stream tenders with the same protection as run_search
+        
+        Paginated stream() overrides call upstream directly, so they run inside
+        the platform bulkhead (the slot is held until the stream ends) and the
+        circuit breaker. The default adapter already goes through run_search().
+        """
+        if type(self).stream is BasePlatform.stream:
+            return self.stream(max_records=max_records, **kwargs)
+        return self._guarded_stream(max_records=max_records, **kwargs)
+    
+    async def _guarded_stream(self, max_records: Optional[int] = None, **kwargs) -> AsyncIterator[TenderRecord]:
+        async with self.bulkhead.acquire():
+            breaker = self.circuit_breaker
+            if not breaker.allow_request():
+                raise PlatformRequestError(
+                    f"{self.platform_name} is unavailable (circuit open), retry in {breaker.retry_after:.0f}s",
+                    status_code=503, retry_after=breaker.retry_after)
+            try:
+                async for record in self.stream(max_records=max_records, **kwargs):
+                    yield record
+            except ValidationError:
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record_failure(str(e))
+                raise
+            except BaseException:
+                # Client went away mid-stream - neither a success nor an upstream failure
+                breaker.release()
+                raise
+            breaker.record_success()
+    
     def get_auth_requirements(self) -> Dict[str, Any]:
         """Override if platform needs authentication"""
         return {"required": False}
@@ -38,30 +105,281 @@ class BasePlatform(ABC):
         """Override to define search parameters"""
         return {}
     
+    def get_search_request_model(self) -> Optional[Type[BaseModel]]:
+        """Override to return the pydantic model that validates search parameters"""
+        return None
+    
+    def get_http_client_settings(self) -> Dict[str, Any]:
+        """Override (or pass config["http"]) to tune the pooled client for this platform"""
+        return self.config.get("http", {})
+    
+    def get_rate_limit(self) -> Dict[str, Any]:
+        """Override (or pass config["rate_limit"]) to set per-host scraping rate and burst"""
+        return self.config.get("rate_limit", {})
+    
+    def get_retry_policy(self) -> RetryPolicy:
+        """Override (or pass config["retry"]) to tune retries for this platform"""
+        return RetryPolicy(**self.config.get("retry", {}))
+    
+    def get_hedge_policy(self) -> HedgePolicy:
+        """Override (or pass config["hedge"]) to opt in to hedged API requests"""
+        return HedgePolicy(**self.config.get("hedge", {}))
+    
+    def get_cache_ttl(self) -> float:
+        """Override (or pass config["cache_ttl"]) to set the response cache TTL in seconds (0 disables)"""
+        return self.config.get("cache_ttl", app_config.CACHE_DEFAULT_TTL)
+    
+    def get_result_cache_ttl(self, result: TenderResponse, cache_ttl: float) -> float:
+        """Override to cache some successful results for less than cache_ttl (0 skips caching)"""
+        return cache_ttl
+    
+    def get_circuit_breaker_settings(self) -> Dict[str, Any]:
+        """Override (or pass config["circuit_breaker"]) to tune the breaker thresholds"""
+        return self.config.get("circuit_breaker", {})
+    
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Circuit breaker shared by all searches on this platform"""
+        return circuit_breakers.get(self.platform_name, **self.get_circuit_breaker_settings())
+    
+    def get_bulkhead_settings(self) -> Dict[str, Any]:
+        """Override (or pass config["bulkhead"]) to bound concurrent upstream searches"""
+        return self.config.get("bulkhead", {})
+    
+    @property
+    def bulkhead(self) -> Bulkhead:
+        """Bulkhead shared by all searches on this platform"""
+        return bulkheads.get(self.platform_name, **self.get_bulkhead_settings())
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared pooled client for this platform"""
+        return client_pool.get_client(self.platform_name, self.get_http_client_settings())
+    
+    async def run_search(self, bypass_cache: bool = False,
+                         stale_while_revalidate: Optional[bool] = None, **kwargs) -> TenderResponse:
+        """
+        Run search through the response cache, single-flight coalescing, the
+        platform bulkhead and the platform circuit breaker
+        
+        Args:
+            bypass_cache: Skip the cache lookup (the fresh result is still cached)
+            stale_while_revalidate: Serve entries past their soft TTL immediately and
+                refresh them in the background (defaults to CACHE_STALE_WHILE_REVALIDATE)
+            **kwargs: Platform search parameters
+        """
+        request_model = self.get_search_request_model()
+        # Invalid parameters are the caller's fault, not an upstream failure
+        search_request = request_model(**kwargs) if request_model else None
+        cache_key = response_cache.make_key(self.platform_name, search_request) if search_request else None
+        cache_ttl = self.get_cache_ttl() if app_config.CACHE_ENABLED else 0
+        if stale_while_revalidate is None:
+            stale_while_revalidate = app_config.CACHE_STALE_WHILE_REVALIDATE
+        
+        if cache_key and cache_ttl > 0 and not bypass_cache:
+            cached = await response_cache.lookup(cache_key, allow_stale=stale_while_revalidate)
+            if cached:
+                response, entry = cached
+                if entry.is_stale:
+                    # Background refresh, deduplicated per key by the single-flight group
+                    search_flights.start(cache_key, lambda: self._fetch_and_cache(cache_key, cache_ttl, **kwargs))
+                response.metadata = {
+                    "cache": {
+                        "hit": True,
+                        "freshness": "stale" if entry.is_stale else "fresh",
+                        "age": round(entry.age, 1),
+                        "ttl": entry.ttl,
+                        "max_stale": entry.max_stale
+                    }
+                }
+                return response
+        
+        if cache_key:
+            # Identical concurrent searches share one upstream call
+            shared_result, coalesced = await search_flights.do(
+                cache_key, lambda: self._fetch_and_cache(cache_key, cache_ttl, **kwargs)
+            )
+            # Each caller gets its own metadata dict to annotate
+            result = shared_result.model_copy(update={"metadata": dict(shared_result.metadata or {})})
+        else:
+            result = await self._search_upstream(**kwargs)
+            result.metadata = result.metadata or {}
+            coalesced = False
+        
+        result.metadata["cache"] = {
+            "hit": False,
+            "freshness": "fresh",
+            "age": 0.0,
+            "bypassed": bypass_cache,
+            "ttl": cache_ttl
+        }
+        result.metadata["coalesced"] = coalesced
+        return result
+    
+    async def _fetch_and_cache(self, cache_key: str, cache_ttl: float, **kwargs) -> TenderResponse:
+        """Search upstream and cache a successful result"""
+        result = await self._search_upstream(**kwargs)
+        if result.status == "success":
+            result_ttl = self.get_result_cache_ttl(result, cache_ttl)
+            # A shortened TTL marks an incomplete result - never serve it stale either
+            await response_cache.store(cache_key, result, result_ttl,
+                                       max_stale=0 if result_ttl < cache_ttl else None)
+        return result
+    
+    async def _search_upstream(self, **kwargs) -> TenderResponse:
+        """Call search inside the platform bulkhead (raises BulkheadFullError when saturated)"""
+        async with self.bulkhead.acquire():
+            return await self._search_with_circuit_breaker(**kwargs)
+    
+    async def _search_with_circuit_breaker(self, **kwargs) -> TenderResponse:
+        """
+        Call search guarded by the platform circuit breaker
+        
+        While the circuit is open the call fails immediately with status
+        "circuit_open" instead of waiting for upstream timeouts. A search that
+        made no upstream request (answered from local state, e.g. a slug cached
+        as dead) says nothing about upstream health and only gives back its slot.
+        """
+        breaker = self.circuit_breaker
+        if not breaker.allow_request():
+            return self.create_circuit_open_response(breaker)
+        
+        attempts = self.request_stats["attempts"]
+        try:
+            result = await self.search(**kwargs)
+        except ValidationError:
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure(str(e))
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        
+        if self.request_stats["attempts"] == attempts:
+            breaker.release()
+        elif result.status == "error":
+            breaker.record_failure(result.error)
+        else:
+            breaker.record_success()
+        return result
+    
     # Helper methods for all platforms
-    async def make_api_request(self, client: httpx.AsyncClient, url: str, 
+    async def make_api_request(self, client: Optional[httpx.AsyncClient], url: str, 
                              headers: Dict[str, str] = None, 
-                             params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Standard API request"""
+                             params: Dict[str, Any] = None,
+                             method: str = "GET",
+                             idempotent: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Standard API request with retries (uses the pooled client when client is None)
+        
+        Transient failures (429/502/503/504, connection errors and timeouts) are
+        retried with exponential backoff and full jitter, honoring Retry-After.
+        Non-idempotent methods are only retried when the request was never sent.
+        """
+        client = client or self.http_client
+        policy = self.get_retry_policy()
+        budget = get_retry_budget(self.platform_name)
+        budget.record_request()
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        
+        attempt = 0
+        retry_started = None
         try:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            raise Exception(f"API request failed: {str(e)}")
+            while True:
+                attempt += 1
+                self.request_stats["attempts"] += 1
+                try:
+                    response = await self._send_request(client, method, url, headers, params, idempotent)
+                    return response.json()
+                except Exception as e:
+                    error = to_request_error(e)
+                    delay = policy.next_delay(attempt, error) if policy.is_retryable(error, idempotent) else None
+                    if delay is None or not budget.try_acquire():
+                        raise error
+                
+                self.request_stats["retries"] += 1
+                retry_started = retry_started or time.monotonic()
+                await asyncio.sleep(delay)
+        finally:
+            if retry_started is not None:
+                self.request_stats["retry_time"] += time.monotonic() - retry_started
     
-    async def make_scraping_request(self, client: httpx.AsyncClient, 
-                                  url: str, headers: Dict[str, str] = None) -> BeautifulSoup:
-        """Standard web scraping request"""
+    async def _send_request(self, client: httpx.AsyncClient, method: str, url: str,
+                            headers: Optional[Dict[str, str]], params: Optional[Dict[str, Any]],
+                            idempotent: bool) -> httpx.Response:
+        """
+        Send one attempt, hedging it when the platform opted in
+        
+        Once the attempt outlives the platform's learned latency percentile a
+        second identical request is sent; the first successful response wins
+        and the other is cancelled (an error status does not win). Hedges are capped at a fraction of recent requests.
+        """
+        tracker = get_latency_tracker(self.platform_name)
+        
+        async def attempt() -> httpx.Response:
+            started = time.monotonic()
+            try:
+                response = await client.request(method, url, headers=headers, params=params)
+                # An error status fails this attempt, so a fast 503 from one request
+                # cannot win the hedge race and cancel the other
+                response.raise_for_status()
+                return response
+            finally:
+                # Cancelled losers still record a lower bound of their latency
+                tracker.record(time.monotonic() - started)
+        
+        policy = self.get_hedge_policy()
+        if not policy.enabled or not idempotent:
+            return await attempt()
+        
+        budget = get_hedge_budget(self.platform_name, policy)
+        budget.record_request()
+        delay = tracker.percentile(policy.percentile, policy.min_samples)
+        if delay is None:
+            return await attempt()
+        
+        response, hedged = await hedged_call(attempt, max(delay, policy.min_delay), budget)
+        if hedged:
+            self.request_stats["hedges"] += 1
+        return response
+    
+    async def fetch_html(self, client: Optional[httpx.AsyncClient], 
+                         url: str, headers: Dict[str, str] = None) -> bytes:
+        """
+        Fetch a page for scraping (rate limited per host) and return the raw body
+        
+        Raises:
+            PlatformRequestError: with status_code for HTTP errors, and the
+                original httpx exception as cause for connection failures
+        """
+        client = client or self.http_client
+        if not headers:
+            headers = self.get_default_headers()
+        # Be respectful - shared per-host token bucket
+        await rate_limiter.acquire(url, **self.get_rate_limit())
+        self.request_stats["attempts"] += 1
         try:
-            if not headers:
-                headers = self.get_default_headers()
             response = await client.get(url, headers=headers, follow_redirects=True)
             response.raise_for_status()
-            await asyncio.sleep(1)  # Be respectful
-            return BeautifulSoup(response.text, 'html.parser')
+        except httpx.HTTPError as e:
+            raise to_request_error(e, "Scraping request failed")
+        return response.content
+    
+    async def make_scraping_request(self, client: Optional[httpx.AsyncClient], 
+                                  url: str, headers: Dict[str, str] = None) -> BeautifulSoup:
+        """Standard web scraping request (uses the pooled client when client is None)"""
+        html = await self.fetch_html(client, url, headers)
+        try:
+            return self.parse_html(html, url)
         except Exception as e:
-            raise Exception(f"Scraping request failed: {str(e)}")
+            raise PlatformRequestError(f"Scraping request failed: {str(e)}", cause=e)
+    
+    def parse_html(self, html: bytes, url: str) -> BeautifulSoup:
+        """Override to use a faster parser or to parse only part of the page"""
+        return BeautifulSoup(html, 'html.parser')
     
     def get_default_headers(self) -> Dict[str, str]:
         """Default headers for web scraping"""
@@ -78,6 +396,15 @@ class BasePlatform(ABC):
             return ""
         return re.sub(r'\s+', ' ', text.strip())
     
+    def get_request_metadata(self) -> Dict[str, Any]:
+        """Upstream request counters for response metadata"""
+        return {
+            "upstream_requests": self.request_stats["attempts"],
+            "retries": self.request_stats["retries"],
+            "retry_time": round(self.request_stats["retry_time"], 3),
+            "hedges": self.request_stats["hedges"]
+        }
+    
     def create_error_response(self, error_msg: str) -> TenderResponse:
         """Standard error response"""
         return TenderResponse(
@@ -86,5 +413,19 @@ class BasePlatform(ABC):
             tenders=[],
             query_info={"error": error_msg},
             status="error",
-            error=error_msg
+            error=error_msg,
+            metadata=self.get_request_metadata()
+        )
+    
+    def create_circuit_open_response(self, breaker: CircuitBreaker) -> TenderResponse:
+        """Fast-fail response while the platform circuit is open"""
+        error_msg = f"{self.platform_name} is unavailable (circuit open), retry in {breaker.retry_after:.0f}s"
+        return TenderResponse(
+            platform=self.platform_name,
+            total_count=0,
+            tenders=[],
+            query_info={"error": error_msg},
+            status="circuit_open",
+            error=error_msg,
+            metadata={"circuit_breaker": breaker.snapshot()}
         )
\ No newline at end of file
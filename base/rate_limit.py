@@ -0,0 +1,90 @@
+"""
+Per-host async token-bucket rate limiting
+Shared by all in-flight requests in the process
+"""
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import asyncio
+import time
+from config import config
+
+
+class TokenBucket:
+    """
+    Async token bucket with reservations
+
+    Each acquire() takes one token. When the bucket is empty the caller reserves
+    a future token and sleeps until it is due, so a burst is spread out at the
+    configured rate instead of hitting the host all at once.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting if the bucket is empty
+
+        Returns:
+            Seconds spent waiting
+        """
+        async with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Give the reserved token back so other waiters are not delayed
+                self._tokens += 1
+                raise
+        return wait
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative when waiters hold reservations)"""
+        self._refill(time.monotonic())
+        return self._tokens
+
+
+class HostRateLimiter:
+    """Registry of token buckets keyed by host"""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def get_bucket(self, host: str, rate: Optional[float] = None,
+                   burst: Optional[int] = None) -> TokenBucket:
+        """Get (or create) the bucket for a host"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(
+                rate=rate or config.SCRAPE_RATE_PER_SECOND,
+                burst=burst or config.SCRAPE_BURST
+            )
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url: str, rate: Optional[float] = None,
+                      burst: Optional[int] = None) -> float:
+        """Wait for budget on the host of url"""
+        host = urlsplit(url).hostname or url
+        return await self.get_bucket(host, rate, burst).acquire()
+
+    def stats(self) -> Dict[str, float]:
+        """Available tokens per host for monitoring"""
+        return {host: round(bucket.available, 2) for host, bucket in self._buckets.items()}
+
+
+# Global rate limiter instance
+rate_limiter = HostRateLimiter()
@@ -0,0 +1,36 @@
+"""
+Fast JSON rendering for tender-returning endpoints
+Endpoints return FastJSONResponse(content) themselves, which skips FastAPI's
+jsonable_encoder pass. A model is dumped by pydantic-core in one call; other
+content goes through orjson, which writes plain values (datetimes as
+isoformat(), like jsonable_encoder) and hands nested models to pydantic-core.
+Either way the bytes match the default path.
+"""
+from typing import Any
+import json
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def render_json(content: Any) -> bytes:
+    """Compact UTF-8 JSON, the same as JSONResponse(jsonable_encoder(content)) renders"""
+    if isinstance(content, BaseModel):
+        return to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content, default=to_jsonable_python, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core / orjson (default encoder when orjson is missing)"""
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
@@ -0,0 +1,151 @@
+"""
+Retry policy for upstream API requests
+Exponential backoff with full jitter, Retry-After support and a per-platform retry budget
+"""
+from typing import Any, Deque, Dict, Optional
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import time
+import httpx
+from config import config
+from .errors import PlatformRequestError
+
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Errors raised before the request reached the server - safe to retry for any method
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def to_request_error(error: Exception, prefix: str = "API request failed") -> PlatformRequestError:
+    """Wrap any request exception, keeping status code and Retry-After"""
+    if isinstance(error, PlatformRequestError):
+        return error
+    status_code = None
+    retry_after = None
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+    return PlatformRequestError(
+        f"{prefix}: {str(error)}",
+        status_code=status_code,
+        retry_after=retry_after,
+        cause=error
+    )
+
+
+class RetryPolicy:
+    """Per-platform retry settings"""
+
+    def __init__(self, max_attempts: int = None, base_delay: float = None,
+                 max_delay: float = None, max_retry_after: float = None,
+                 retry_statuses: set = None):
+        self.max_attempts = max_attempts or config.RETRY_MAX_ATTEMPTS
+        self.base_delay = base_delay if base_delay is not None else config.RETRY_BASE_DELAY
+        self.max_delay = max_delay if max_delay is not None else config.RETRY_MAX_DELAY
+        self.max_retry_after = max_retry_after if max_retry_after is not None else config.RETRY_MAX_RETRY_AFTER
+        self.retry_statuses = retry_statuses or RETRYABLE_STATUS_CODES
+
+    def is_retryable(self, error: PlatformRequestError, idempotent: bool) -> bool:
+        """Transient failure that can be retried for this kind of request"""
+        if isinstance(error.cause, NOT_SENT_ERRORS):
+            return True
+        if not idempotent:
+            return False
+        if error.status_code is not None:
+            return error.status_code in self.retry_statuses
+        return isinstance(error.cause, httpx.TransportError)
+
+    def next_delay(self, attempt: int, error: PlatformRequestError) -> Optional[float]:
+        """
+        Delay before the next attempt
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+            error: The failure
+
+        Returns:
+            Seconds to wait, or None when no further attempt should be made
+        """
+        if attempt >= self.max_attempts:
+            return None
+        # Full jitter: uniform between 0 and the capped exponential delay
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        if error.retry_after is not None:
+            if error.retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, error.retry_after)
+        return delay
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of recent requests
+
+    Keeps a platform-wide outage from multiplying upstream load: once retries
+    exceed ratio * requests (plus a small floor) in the window, failures are
+    returned immediately.
+    """
+
+    def __init__(self, ratio: float = None, min_retries: int = None, window: float = 10.0):
+        self.ratio = ratio if ratio is not None else config.RETRY_BUDGET_RATIO
+        self.min_retries = min_retries if min_retries is not None else config.RETRY_BUDGET_MIN_RETRIES
+        self.window = window
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+
+    def _trim(self, now: float):
+        cutoff = now - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+    def record_request(self):
+        """Count an original (non-retry) request"""
+        # Trim here too: a healthy platform never calls try_acquire(), and the deque must stay within the window
+        now = time.monotonic()
+        self._trim(now)
+        self._requests.append(now)
+
+    def try_acquire(self) -> bool:
+        """Take budget for one retry if available"""
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+            return False
+        self._retries.append(now)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        return {"requests": len(self._requests), "retries": len(self._retries)}
+
+
+# Retry budgets shared by all requests to the same platform
+retry_budgets: Dict[str, RetryBudget] = {}
+
+
+def get_retry_budget(platform_name: str) -> RetryBudget:
+    """Get (or create) the retry budget of a platform"""
+    budget = retry_budgets.get(platform_name)
+    if budget is None:
+        budget = retry_budgets[platform_name] = RetryBudget()
+    return budget
@@ -0,0 +1,57 @@
+"""
+Single-flight coalescing of identical concurrent calls
+"""
+from typing import Any, Awaitable, Callable, Dict, Tuple
+import asyncio
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time
+
+    Concurrent callers with the same key await the same task and receive its
+    result. Callers wait through asyncio.shield, so cancelling one waiter never
+    cancels the shared call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def start(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[asyncio.Task, bool]:
+        """
+        Get the in-flight task for key, starting call() if there is none
+
+        Returns:
+            (task, shared) where shared is True when joining an existing call
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            return task, True
+        task = asyncio.ensure_future(call())
+        self._calls[key] = task
+        task.add_done_callback(lambda t: self._forget(key, t))
+        return task, False
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await the shared call for key
+
+        Returns:
+            (result, shared) where shared is True when the result came from another caller's call
+        """
+        task, shared = self.start(key, call)
+        return await asyncio.shield(task), shared
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+# Shared by all platform searches in the process
+search_flights = SingleFlight()
@@ -0,0 +1,66 @@
+"""
+Newline-delimited JSON (NDJSON) streaming of search results
+Each line is one JSON object: {"type": "tender", ...} per Tender, then a
+final {"type": "summary", ...} or {"type": "error", ...} line
+"""
+from typing import Any, AsyncIterator, Dict, Union
+import logging
+import math
+import time
+from pydantic import BaseModel
+from pydantic_core import to_json
+from .models import TenderRecord
+from config import config
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_line(payload: Dict[str, Any]) -> bytes:
+    # pydantic-core formats record datetimes the same way as tenders in /search responses
+    return to_json(payload) + b"\n"
+
+
+async def ndjson_stream(platform_name: str, items: AsyncIterator[Union[TenderRecord, BaseModel, dict]],
+                        chunk_size: int = None) -> AsyncIterator[bytes]:
+    """
+    Encode tender records (or models / plain dicts) as NDJSON lines, sent in chunks of chunk_size items
+
+    At most one chunk is buffered, so memory is bounded by the chunk size rather
+    than the result size. The HTTP status is sent before the first chunk, so
+    upstream failures in the middle of a stream are reported as a trailing
+    error line instead.
+    """
+    chunk_size = chunk_size or config.STREAM_CHUNK_SIZE
+    start_time = time.time()
+    count = 0
+    chunk = []
+    try:
+        async for item in items:
+            count += 1
+            data = item.to_dict() if isinstance(item, TenderRecord) else item
+            chunk.append(ndjson_line({"type": "tender", "platform": platform_name, "data": data}))
+            if len(chunk) >= chunk_size:
+                yield b"".join(chunk)
+                chunk = []
+    except Exception as e:
+        logger.warning(f"{platform_name} stream failed after {count} results: {e}")
+        error = {"type": "error", "platform": platform_name, "count": count, "error": str(e)}
+        if getattr(e, "retry_after", None) is not None:
+            error["retry_after"] = max(1, math.ceil(e.retry_after))
+        chunk.append(ndjson_line(error))
+        yield b"".join(chunk)
+        return
+    finally:
+        # Release whatever the source holds (bulkhead slot, page fetches) as soon as the client leaves
+        aclose = getattr(items, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    chunk.append(ndjson_line({
+        "type": "summary",
+        "platform": platform_name,
+        "count": count,
+        "execution_time": round(time.time() - start_time, 3)
+    }))
+    yield b"".join(chunk)
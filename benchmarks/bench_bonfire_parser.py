@@ -0,0 +1,82 @@
+"""
+Bonfire parser benchmark
+Compares full-page html.parser parsing (the old path) with the strained
+lxml parser on saved portal pages, and checks both extract the same solicitations
+
+Run from the repository root:
+    python benchmarks/bench_bonfire_parser.py [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from platforms.bonfire_parser import HTML_PARSER, parse_bonfire_solicitations, parse_portal_html
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BASE_URL = "https://example.gobonfire.com/portal/solicitations"
+
+
+def full_page_parse(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, "html.parser")
+
+
+def strained_html_parser(html: str) -> BeautifulSoup:
+    return parse_portal_html(html, parser="html.parser")
+
+
+def comparable(results: list) -> list:
+    """Results without fields that depend on the parser's serialization"""
+    return [{k: v for k, v in item.items() if k != "metadata"} for item in results]
+
+
+def bench(parse, html: str, search_params: dict, repeat: int, use_plan: bool = False):
+    # A repeat scrape of the portal reuses the selector plan learned by the first one
+    plan = parse_bonfire_solicitations(parse(html), BASE_URL, search_params)["plan"] if use_plan else None
+    parse_time = extract_time = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soup = parse(html)
+        parsed = time.perf_counter()
+        results = parse_bonfire_solicitations(soup, BASE_URL, search_params, plan)["results"]
+        extract_time += time.perf_counter() - parsed
+        parse_time += parsed - start
+    return parse_time / repeat * 1000, extract_time / repeat * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    search_params = {"organization": "example", "keywords": None, "status": "all", "limit": 50}
+    candidates = [("html.parser (full page)", full_page_parse, False),
+                  ("html.parser (strained)", strained_html_parser, False)]
+    if HTML_PARSER != "html.parser":
+        candidates.append((f"{HTML_PARSER} (strained)", parse_portal_html, False))
+    candidates.append((f"{HTML_PARSER} (strained, plan)", parse_portal_html, True))
+
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if not name.startswith("bonfire_") or not name.endswith(".html"):
+            continue
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            html = f.read()
+        print(f"\n{name} ({len(html) // 1024} KiB, {args.repeat} runs)")
+        print(f"  {'parser':<32}{'parse ms':>10}{'extract ms':>12}{'total ms':>10}{'speedup':>9}")
+
+        baseline = expected = None
+        for label, parse, use_plan in candidates:
+            parse_ms, extract_ms, results = bench(parse, html, search_params, args.repeat, use_plan)
+            total = parse_ms + extract_ms
+            if baseline is None:
+                baseline, expected = total, comparable(results)
+            elif comparable(results) != expected:
+                raise SystemExit(f"{label} extracted different solicitations from {name}")
+            print(f"  {label:<32}{parse_ms:>10.2f}{extract_ms:>12.2f}{total:>10.2f}{baseline / total:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Field mapper benchmark
+Compares the old normalization (upstream record -> result dict -> Tender) with
+each platform's compiled FieldMapper (upstream record -> Tender), per platform
+
+Run from the repository root:
+    python benchmarks/bench_field_mappers.py [--records 2000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base.models import RESULT_KEYS, Tender
+from platforms.bonfire import BONFIRE_MAPPER
+from platforms.bonfire_parser import parse_solicitations
+from platforms.sam import SAM_MAPPER
+from platforms.ted import TED_MAPPER
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BASE_URL = "https://example.gobonfire.com/portal/solicitations"
+
+
+def ted_notices(count: int) -> list:
+    return [{
+        "noticeId": f"{i:06d}-2024",
+        "title": f"Construction works for public building {i % 40}",
+        "publicationDate": "2024-03-01+01:00",
+        "deadline": "2024-04-15T12:00:00+01:00",
+        "country": "FR",
+        "contractingAuthority": "Ville de Lyon",
+        "cpvCodes": ["45000000", "45210000"],
+        "estimatedValue": 250000 + i,
+        "procedureType": "open"
+    } for i in range(count)]
+
+
+def sam_opportunities(count: int) -> list:
+    return [{
+        "noticeId": f"notice-{i:06d}",
+        "title": f"Facilities maintenance and repair services, region {i % 50}",
+        "solicitationNumber": f"W912-{i:05d}",
+        "department": "DEPT OF DEFENSE",
+        "office": "W6QK ACC-APG",
+        "postedDate": "2024-03-01",
+        "responseDeadLine": "2024-04-01T17:00:00-04:00",
+        "type": "Solicitation",
+        "naicsCode": "561210",
+        "typeOfSetAsideDescription": "Total Small Business Set-Aside",
+        "active": "Yes",
+        **({"award": {"date": "2024-05-01", "number": "A1", "amount": "125000",
+                      "awardee": {"name": "ACME"}}} if i % 4 == 0 else {})
+    } for i in range(count)]
+
+
+def bonfire_solicitations(count: int) -> list:
+    """Parsed solicitation dicts from the saved card portal page, repeated to count"""
+    with open(os.path.join(FIXTURES_DIR, "bonfire_portal_cards.html"), "rb") as f:
+        html = f.read()
+    search_params = {"organization": "example", "keywords": None, "status": "all", "limit": 1000}
+    parsed = parse_solicitations(html, BASE_URL, search_params)["results"]
+    return [parsed[i % len(parsed)] for i in range(count)]
+
+
+# Previous per-platform processing, kept here for comparison
+
+def legacy_ted(notice: dict) -> dict:
+    return {
+        "id": notice.get("noticeId"),
+        "title": notice.get("title"),
+        "publication_date": notice.get("publicationDate"),
+        "deadline": notice.get("deadline"),
+        "country": notice.get("country"),
+        "contracting_authority": notice.get("contractingAuthority"),
+        "cpv_codes": notice.get("cpvCodes", []),
+        "estimated_value": notice.get("estimatedValue"),
+        "procedure_type": notice.get("procedureType"),
+        "url": f"https://ted.europa.eu/udl?uri=TED:NOTICE:{notice.get('noticeId')}"
+    }
+
+
+def legacy_sam(opp: dict) -> dict:
+    processed_opp = {
+        "id": opp.get("noticeId"),
+        "title": opp.get("title"),
+        "solicitation_number": opp.get("solicitationNumber"),
+        "department": opp.get("department"),
+        "office": opp.get("office"),
+        "posted_date": opp.get("postedDate"),
+        "response_deadline": opp.get("responseDeadLine"),
+        "type": opp.get("type"),
+        "naics_code": opp.get("naicsCode"),
+        "set_aside_type": opp.get("typeOfSetAsideDescription"),
+        "active": opp.get("active"),
+        "url": f"https://sam.gov/opp/{opp.get('noticeId')}"
+    }
+    if "award" in opp:
+        award = opp["award"]
+        processed_opp["award"] = {
+            "date": award.get("date"),
+            "number": award.get("number"),
+            "amount": award.get("amount"),
+            "awardee": award.get("awardee", {}).get("name")
+        }
+    return processed_opp
+
+
+def legacy_bonfire(solicitation: dict) -> dict:
+    # The parser already produced the result dict
+    return solicitation
+
+
+PLATFORMS = (
+    ("TED Europe", ted_notices, legacy_ted, TED_MAPPER),
+    ("SAM.gov", sam_opportunities, legacy_sam, SAM_MAPPER),
+    ("Bonfire", bonfire_solicitations, legacy_bonfire, BONFIRE_MAPPER),
+)
+
+
+def bench(normalize, records: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for record in records:
+            normalize(record)
+        best = min(best, time.perf_counter() - start)
+    return len(records) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.records} records per platform, best of {args.repeat} runs (records/s)")
+    print(f"  {'platform':<12}{'dict -> Tender':>16}{'FieldMapper':>14}{'speedup':>10}")
+    for name, make_records, legacy, mapper in PLATFORMS:
+        records = make_records(args.records)
+        old = bench(lambda record: Tender.from_result(legacy(record)), records, args.repeat)
+        new = bench(mapper.map, records, args.repeat)
+        print(f"  {name:<12}{old:>16,.0f}{new:>14,.0f}{new / old:>9.1f}x")
+
+        # The results view built from mapped tenders keeps every legacy key
+        view = mapper.map(records[0]).as_result(RESULT_KEYS.get(name))
+        missing = set(legacy(records[0])) - set(view)
+        if missing:
+            raise SystemExit(f"{name} results view lost keys: {sorted(missing)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+JSON response rendering benchmark
+Compares FastAPI's default path (jsonable_encoder, then JSONResponse's
+json.dumps) with FastJSONResponse (pydantic-core) for the shapes returned by
+/search/{platform_name}, /latest-tenders and /database/tenders, and checks
+both produce the same bytes
+
+Run from the repository root:
+    python benchmarks/bench_json_response.py [--records 500] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from base.models import TenderResponse
+from base.responses import FastJSONResponse
+from bench_field_mappers import sam_opportunities, ted_notices
+from platforms.sam import SAM_MAPPER
+from platforms.ted import TED_MAPPER
+
+
+def search_response(count: int) -> TenderResponse:
+    response = TenderResponse.from_records(
+        SAM_MAPPER.map_all(sam_opportunities(count)), platform="SAM.gov", total_count=count,
+        query_info={"search_params": {"posted_from": "01/01/2024", "posted_to": "03/31/2024"}},
+        metadata={"execution_time": 0.412, "cache": {"hit": False}})
+    # Tender models are built once either way; time only the rendering
+    return response.materialize()
+
+
+def latest_tenders(count: int) -> dict:
+    ted = TenderResponse.from_records(TED_MAPPER.map_all(ted_notices(count)), platform="TED Europe",
+                                      total_count=count).materialize()
+    return {
+        "status": "success",
+        "total_tenders": count,
+        "platforms": {"ted": {"status": "success", "total_count": count, "tenders": ted.tenders}},
+        "metadata": {"timestamp": datetime.now().isoformat()}
+    }
+
+
+def stored_tenders(count: int) -> dict:
+    """Rows as returned by supabase search_tenders (plain JSON values)"""
+    rows = [{
+        "id": i,
+        "platform": "sam",
+        "platform_id": f"notice-{i:06d}",
+        "title": f"Facilities maintenance and repair services, region {i % 50}",
+        "posted_date": "2024-03-01T00:00:00",
+        "estimated_value": 125000.5 + i,
+        "raw_data": {"extra": {"naics_code": "561210", "award": None}},
+        "created_at": datetime(2024, 3, 2, 9, 30, tzinfo=timezone.utc)
+    } for i in range(count)]
+    return {"tenders": rows, "count": count, "platform_filter": "sam",
+            "pagination": {"limit": count, "offset": 0}}
+
+
+def default_path(content) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_path(content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def bench(render, content, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = render(content)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.records} tenders per response, best of {args.repeat} runs")
+    print(f"  {'endpoint':<22}{'default ms':>12}{'fast ms':>10}{'speedup':>10}{'bytes':>10}")
+    for name, build in (("/search/sam", search_response),
+                        ("/latest-tenders", latest_tenders),
+                        ("/database/tenders", stored_tenders)):
+        content = build(args.records)
+        default_ms, default_body = bench(default_path, content, args.repeat)
+        fast_ms, fast_body = bench(fast_path, content, args.repeat)
+        print(f"  {name:<22}{default_ms:>12.2f}{fast_ms:>10.2f}{default_ms / fast_ms:>9.1f}x{len(fast_body):>10}")
+        if fast_body != default_body:
+            raise SystemExit(f"{name}: rendered bodies differ")
+
+
+if __name__ == "__main__":
+    main()
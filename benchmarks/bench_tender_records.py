@@ -0,0 +1,80 @@
+"""
+Tender record benchmark
+Compares holding a batch as pydantic Tender models with holding it as slotted
+TenderRecords (validated into Tender only when the response is serialized):
+build time, memory per tender, and the cost of the storage rows and response body
+
+Run from the repository root:
+    python benchmarks/bench_tender_records.py [--records 20000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pydantic_core import to_jsonable_python
+from base.models import TENDER_LIST, TenderResponse
+from bench_field_mappers import sam_opportunities
+from platforms.sam import SAM_MAPPER
+
+
+def storage_rows(items) -> list:
+    """The per-tender part of main.save_tender_results"""
+    return [{
+        "platform_id": item.id,
+        "title": item.title,
+        "posted_date": item.posted_date.isoformat() if item.posted_date else None,
+        "raw_data": item.model_dump(mode="json") if hasattr(item, "model_dump") else to_jsonable_python(item.to_dict())
+    } for item in items]
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    opportunities = sam_opportunities(args.records)
+    print(f"{args.records} SAM-shaped opportunities")
+    print(f"  {'pipeline':<20}{'build ms':>10}{'bytes/tender':>14}{'rows ms':>10}{'body ms':>10}")
+
+    # Models: every mapped record validated into a Tender up front, as responses used to hold them
+    def build_models():
+        return TENDER_LIST.validate_python(SAM_MAPPER.map_all(opportunities), from_attributes=True)
+
+    for label, build in (("Tender models", build_models),
+                         ("TenderRecords", lambda: SAM_MAPPER.map_all(opportunities))):
+        items, build_time, size = measure(build)
+        start = time.perf_counter()
+        storage_rows(items)
+        rows_time = time.perf_counter() - start
+        if label == "Tender models":
+            response = TenderResponse(platform="SAM.gov", total_count=len(items), tenders=items)
+        else:
+            response = TenderResponse.from_records(items, platform="SAM.gov", total_count=len(items))
+        start = time.perf_counter()
+        body = response.model_dump_json()
+        body_time = time.perf_counter() - start
+        print(f"  {label:<20}{build_time * 1000:>10.1f}{size / len(items):>14.0f}"
+              f"{rows_time * 1000:>10.1f}{body_time * 1000:>10.1f}")
+        del items, response, body
+        gc.collect()
+
+
+if __name__ == "__main__":
+    main()
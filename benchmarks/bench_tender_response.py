@@ -0,0 +1,92 @@
+"""
+TenderResponse payload benchmark
+Compares the legacy response (results dicts plus the tenders built from them,
+both serialized) with the canonical tenders-only response
+
+Run from the repository root:
+    python benchmarks/bench_tender_response.py [--records 1000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from base.models import Tender, TenderResponse
+
+
+def sam_like_results(count: int) -> list:
+    """Result dicts shaped like SAMPlatform._process_opportunity output"""
+    return [{
+        "id": f"notice-{i:06d}",
+        "title": f"Facilities maintenance and repair services, region {i % 50}",
+        "solicitation_number": f"W912-{i:05d}",
+        "department": "DEPT OF DEFENSE",
+        "office": "W6QK ACC-APG",
+        "posted_date": "2024-03-01",
+        "response_deadline": "2024-04-01T17:00:00-04:00",
+        "type": "Solicitation",
+        "naics_code": "561210",
+        "set_aside_type": "Total Small Business Set-Aside",
+        "active": "Yes",
+        "url": f"https://sam.gov/opp/notice-{i:06d}",
+        "award": {"date": None, "number": None, "amount": None, "awardee": None}
+    } for i in range(count)]
+
+
+def build(results: list, legacy: bool) -> TenderResponse:
+    if not legacy:
+        return TenderResponse(platform="SAM.gov", total_count=len(results), results=results)
+    # Previous layout: tenders built with Tender(**item) (platform-specific keys dropped)
+    # and the results dicts kept and sent alongside them
+    response = TenderResponse(platform="SAM.gov", total_count=len(results),
+                              tenders=[Tender(**item) for item in results])
+    response.results = results
+    return response
+
+
+def bench(results: list, legacy: bool, repeat: int):
+    build_time = encode_time = 0.0
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = build(results, legacy)
+        built = time.perf_counter()
+        # What FastAPI does with an endpoint's return value, plus the bytes it sends
+        payload = jsonable_encoder(response)
+        body = response.model_dump_json()
+        encode_time += time.perf_counter() - built
+        build_time += built - start
+        size = len(body)
+    return build_time / repeat * 1000, encode_time / repeat * 1000, size, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = sam_like_results(args.records)
+    print(f"{args.records} SAM-shaped records, {args.repeat} runs")
+    print(f"  {'response':<28}{'build ms':>10}{'encode ms':>11}{'bytes':>11}")
+    rows = []
+    for label, legacy in (("results + tenders (legacy)", True), ("tenders only", False)):
+        build_ms, encode_ms, size, _ = bench(results, legacy, args.repeat)
+        rows.append((build_ms + encode_ms, size))
+        print(f"  {label:<28}{build_ms:>10.2f}{encode_ms:>11.2f}{size:>11}")
+    (legacy_ms, legacy_size), (canonical_ms, canonical_size) = rows
+    print(f"  saved {legacy_ms - canonical_ms:.2f} ms per response "
+          f"({legacy_ms / canonical_ms:.1f}x) and {100 * (1 - canonical_size / legacy_size):.0f}% of the payload")
+
+    # The opt-in view still returns every original key
+    view = TenderResponse(platform="SAM.gov", total_count=len(results), results=results).results_view()
+    missing = set(results[0]) - set(view[0])
+    if missing:
+        raise SystemExit(f"results view lost keys: {sorted(missing)}")
+
+
+if __name__ == "__main__":
+    main()
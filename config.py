@@ -52,6 +52,94 @@ class Config:
     ENABLE_TED_STORAGE: bool = os.getenv("ENABLE_TED_STORAGE", "true").lower() == "true"
     ENABLE_BONFIRE_STORAGE: bool = os.getenv("ENABLE_BONFIRE_STORAGE", "true").lower() == "true"
     
+    # HTTP Client Configuration (shared pooled clients, one per platform)
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "30.0"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30.0"))
+    HTTP_ENABLE_HTTP2: bool = os.getenv("HTTP_ENABLE_HTTP2", "false").lower() == "true"
+    
+    # Scraping rate limit (per-host token bucket, shared across requests)
+    SCRAPE_RATE_PER_SECOND: float = float(os.getenv("SCRAPE_RATE_PER_SECOND", "1.0"))
+    SCRAPE_BURST: int = int(os.getenv("SCRAPE_BURST", "3"))
+    
+    # Retry policy for upstream API requests
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+    RETRY_BASE_DELAY: float = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+    RETRY_MAX_DELAY: float = float(os.getenv("RETRY_MAX_DELAY", "8.0"))
+    RETRY_MAX_RETRY_AFTER: float = float(os.getenv("RETRY_MAX_RETRY_AFTER", "30.0"))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+    RETRY_BUDGET_MIN_RETRIES: int = int(os.getenv("RETRY_BUDGET_MIN_RETRIES", "5"))
+    
+    # SAM.gov pagination (iter_search)
+    SAM_PAGE_SIZE: int = int(os.getenv("SAM_PAGE_SIZE", "100"))
+    SAM_PAGE_CONCURRENCY: int = int(os.getenv("SAM_PAGE_CONCURRENCY", "4"))
+    # SAM.gov date-window sharding (iter_sharded / sharded=true)
+    SAM_SHARD_MAX_DAYS: int = int(os.getenv("SAM_SHARD_MAX_DAYS", "365"))
+    SAM_SHARD_MAX_RECORDS: int = int(os.getenv("SAM_SHARD_MAX_RECORDS", "1000"))
+    SAM_SHARD_CONCURRENCY: int = int(os.getenv("SAM_SHARD_CONCURRENCY", "4"))
+    
+    # TED pagination (iter_search / streaming)
+    TED_PAGE_SIZE: int = int(os.getenv("TED_PAGE_SIZE", "100"))
+    
+    # NDJSON streaming (/stream/{platform_name})
+    STREAM_CHUNK_SIZE: int = int(os.getenv("STREAM_CHUNK_SIZE", "50"))
+    
+    # Multi-platform search (/search/all) - seconds each platform gets before it is reported as a timeout
+    SEARCH_ALL_DEADLINE: float = float(os.getenv("SEARCH_ALL_DEADLINE", "20.0"))
+    
+    # HTML parsing pool for scraping platforms (process, thread or inline)
+    PARSE_POOL_KIND: str = os.getenv("PARSE_POOL_KIND", "process")
+    PARSE_POOL_SIZE: int = int(os.getenv("PARSE_POOL_SIZE", "2"))
+    
+    # Learned Bonfire selector plans (per portal)
+    BONFIRE_SELECTOR_PLANS_PATH: str = os.getenv("BONFIRE_SELECTOR_PLANS_PATH", "cache/bonfire_selector_plans.json")
+    
+    # Bonfire batch search (organizations=[...] or "all")
+    BONFIRE_BATCH_CONCURRENCY: int = int(os.getenv("BONFIRE_BATCH_CONCURRENCY", "8"))
+    BONFIRE_ORG_TIMEOUT: float = float(os.getenv("BONFIRE_ORG_TIMEOUT", "15.0"))
+    
+    # Bonfire slug resolution cache (live portals vs. 404/410 or no-DNS subdomains)
+    BONFIRE_SLUG_CACHE_PATH: str = os.getenv("BONFIRE_SLUG_CACHE_PATH", "cache/bonfire_slugs.sqlite3")
+    BONFIRE_SLUG_POSITIVE_TTL: float = float(os.getenv("BONFIRE_SLUG_POSITIVE_TTL", str(7 * 24 * 3600)))
+    BONFIRE_SLUG_NEGATIVE_TTL: float = float(os.getenv("BONFIRE_SLUG_NEGATIVE_TTL", str(6 * 3600)))
+    
+    # Hedged requests (opt-in per API platform)
+    ENABLE_SAM_HEDGING: bool = os.getenv("ENABLE_SAM_HEDGING", "false").lower() == "true"
+    ENABLE_TED_HEDGING: bool = os.getenv("ENABLE_TED_HEDGING", "false").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+    HEDGE_MAX_RATIO: float = float(os.getenv("HEDGE_MAX_RATIO", "0.1"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    HEDGE_LATENCY_WINDOW: int = int(os.getenv("HEDGE_LATENCY_WINDOW", "200"))
+    
+    # Circuit breaker (per platform)
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RECOVERY_TIMEOUT: float = float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30.0"))
+    CIRCUIT_HALF_OPEN_MAX_CALLS: int = int(os.getenv("CIRCUIT_HALF_OPEN_MAX_CALLS", "1"))
+    
+    # Bulkheads (per platform concurrent upstream searches and wait queue)
+    BULKHEAD_MAX_CONCURRENT: int = int(os.getenv("BULKHEAD_MAX_CONCURRENT", "10"))
+    BULKHEAD_MAX_QUEUE: int = int(os.getenv("BULKHEAD_MAX_QUEUE", "20"))
+    BULKHEAD_QUEUE_TIMEOUT: float = float(os.getenv("BULKHEAD_QUEUE_TIMEOUT", "10.0"))
+    
+    # Response cache (TTL in seconds, memory bound in bytes)
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_DEFAULT_TTL: float = float(os.getenv("CACHE_DEFAULT_TTL", "300"))
+    CACHE_TTL_SAM: float = float(os.getenv("CACHE_TTL_SAM", "900"))
+    CACHE_TTL_TED: float = float(os.getenv("CACHE_TTL_TED", "600"))
+    CACHE_TTL_BONFIRE: float = float(os.getenv("CACHE_TTL_BONFIRE", "900"))
+    # Bonfire batches where some portals timed out or failed (0 = don't cache them)
+    CACHE_TTL_BONFIRE_PARTIAL: float = float(os.getenv("CACHE_TTL_BONFIRE_PARTIAL", "60"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "2000"))
+    # Stale-while-revalidate: serve entries up to CACHE_MAX_STALE seconds past their TTL
+    CACHE_STALE_WHILE_REVALIDATE: bool = os.getenv("CACHE_STALE_WHILE_REVALIDATE", "false").lower() == "true"
+    CACHE_MAX_STALE: float = float(os.getenv("CACHE_MAX_STALE", "3600"))
+    # Persistent second tier (SQLite file shared by workers on the same host)
+    CACHE_DISK_ENABLED: bool = os.getenv("CACHE_DISK_ENABLED", "true").lower() == "true"
+    CACHE_DISK_PATH: str = os.getenv("CACHE_DISK_PATH", "cache/responses.sqlite3")
+    CACHE_DISK_MAX_BYTES: int = int(os.getenv("CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+    
     @classmethod
     def get_database_url(cls, connection_type: str = "transaction") -> str:
         """
@@ -1,15 +1,28 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Awaitable, AsyncIterator, Annotated
+from contextlib import asynccontextmanager
+from pydantic import Field, TypeAdapter, ValidationError
+from pydantic_core import to_jsonable_python
 import asyncio
+import math
 import os
 import time
 import logging
 from datetime import datetime
 from base.models import TenderResponse, Tender
+from base.http_client import client_pool
+from base.cache import response_cache
+from base.parsing_pool import parsing_pool
+from base.errors import BulkheadFullError
+from base.circuit_breaker import CircuitState
+from base.streaming import NDJSON_MEDIA_TYPE, ndjson_line, ndjson_stream
+from base.responses import FastJSONResponse
 from platforms import get_platform, get_all_platforms, REGISTERED_PLATFORMS
+from platforms.bonfire_slugs import slug_resolutions
 
 # Supabase integration
 from config import config
@@ -20,25 +33,9 @@ from supabase_client import get_supabase
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="Modular Tender API with Supabase",
-    description="Scalable multi-platform tender search API with Supabase database integration",
-    version="2.1.0"
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Initialize database on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database and Supabase on startup"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize database, Supabase, pooled HTTP clients and parsing workers; release them at shutdown"""
     try:
         # Initialize database tables
         init_database()
@@ -53,6 +50,48 @@ async def startup_event():
             
     except Exception as e:
         logger.error(f"Startup initialization failed: {e}")
+    
+    # Open one pooled HTTP client per registered platform
+    client_pool.open(platform_class() for platform_class in REGISTERED_PLATFORMS.values())
+    
+    # Start and warm up the HTML parsing workers before the first scrape
+    try:
+        await parsing_pool.start()
+    except Exception as e:
+        logger.error(f"Parsing pool warm-up failed: {e}")
+    
+    yield
+    
+    await client_pool.aclose()
+    response_cache.close()
+    slug_resolutions.close()
+    parsing_pool.shutdown()
+    logger.info("HTTP client pool, response and slug caches, and parsing pool closed")
+
+app = FastAPI(
+    title="Modular Tender API with Supabase",
+    description="Scalable multi-platform tender search API with Supabase database integration",
+    version="2.1.0",
+    lifespan=lifespan
+)
+
+# Add CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+@app.exception_handler(BulkheadFullError)
+async def bulkhead_full_handler(request, exc: BulkheadFullError):
+    """Platform at capacity - tell the client when to retry"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(int(exc.retry_after))}
+    )
 
 # Mount static files for testing interface
 if os.path.exists("static"):
@@ -93,26 +132,26 @@ async def save_tender_results(platform_name: str, search_params: Dict[str, Any],
             'bonfire': config.ENABLE_BONFIRE_STORAGE
         }
         
-        if storage_enabled.get(platform_name, False) and results.tenders:
+        if storage_enabled.get(platform_name, False) and results.records:
             tender_data_list = []
             
-            for tender in results.tenders:
+            for record in results.records:
                 tender_data = {
                     'platform': platform_name,
-                    'platform_id': getattr(tender, 'id', None),
-                    'title': tender.title,
-                    'description': tender.description,
-                    'organization': tender.organization,
-                    'url': tender.url,
-                    'notice_id': getattr(tender, 'notice_id', None),
-                    'posted_date': tender.posted_date.isoformat() if tender.posted_date else None,
-                    'response_deadline': tender.response_deadline.isoformat() if tender.response_deadline else None,
-                    'estimated_value': getattr(tender, 'estimated_value', None),
-                    'currency': getattr(tender, 'currency', None),
-                    'category': getattr(tender, 'category', None),
-                    'type': getattr(tender, 'type', None),
-                    'status': getattr(tender, 'status', None),
-                    'raw_data': tender.__dict__,  # Store full tender object as JSON
+                    'platform_id': record.id,
+                    'title': record.title,
+                    'description': record.description,
+                    'organization': record.organization,
+                    'url': record.url,
+                    'notice_id': record.notice_id,
+                    'posted_date': record.posted_date.isoformat() if record.posted_date else None,
+                    'response_deadline': record.response_deadline.isoformat() if record.response_deadline else None,
+                    'estimated_value': record.estimated_value,
+                    'currency': record.currency,
+                    'category': record.category,
+                    'type': record.type,
+                    'status': record.status,
+                    'raw_data': to_jsonable_python(record.to_dict()),  # Store full tender as JSON
                     'search_query': str(search_params)
                 }
                 tender_data_list.append(tender_data)
@@ -185,13 +224,19 @@ async def get_platforms_info():
                 if env_var and os.getenv(env_var, "").startswith("YOUR_"):
                     status = "needs_configuration"
             
+            circuit = instance.circuit_breaker.snapshot()
+            if circuit["state"] != "closed":
+                status = f"circuit_{circuit['state']}"
+            
             platforms_list.append({
                 "name": name,
                 "display_name": instance.platform_name,
                 "base_url": instance.base_url,
                 "status": status,
                 "auth_requirements": auth_req,
-                "search_params": instance.get_search_params_schema()
+                "search_params": instance.get_search_params_schema(),
+                "circuit_breaker": circuit,
+                "bulkhead": instance.bulkhead.snapshot()
             })
             
         except Exception as e:
@@ -208,25 +253,154 @@ async def get_platforms_info():
         "total": len(platforms_list)
     }
 
+def retry_after_seconds(retry_after: float) -> int:
+    """Retry-After hint in whole seconds (at least 1)"""
+    return max(1, math.ceil(retry_after))
+
+def platform_error(platform_name: str, error: str, status: str, retry_after: Optional[float] = None) -> Dict[str, Any]:
+    outcome = {"error": error, "platform": platform_name, "status": status}
+    if retry_after is not None:
+        outcome["retry_after"] = retry_after_seconds(retry_after)
+    return outcome
+
+def outcome_retry_after(outcome: Any) -> Optional[int]:
+    if isinstance(outcome, TenderResponse):
+        return outcome.metadata.get("retry_after")
+    return outcome.get("retry_after")
+
+async def search_with_deadline(platform_name: str, platform, params: Dict[str, Any],
+                               deadline: float, include_results: bool) -> Tuple[str, Any]:
+    """
+    Run one platform's part of /search/all, bounded by deadline
+    
+    Never raises: failures and timeouts become error dicts. A timed-out search
+    keeps running in the single-flight group, so its result is still cached.
+    Outcomes worth retrying later carry retry_after (seconds): "timeout" (one
+    deadline, by which the running search has filled the cache), "rejected"
+    (bulkhead full), upstream errors with Retry-After, and "circuit_open"
+    responses (in metadata).
+    """
+    try:
+        result = await asyncio.wait_for(platform.run_search(**params), deadline)
+    except asyncio.TimeoutError:
+        return platform_name, platform_error(platform_name, f"No response within {deadline:g}s", "timeout", deadline)
+    except BulkheadFullError as e:
+        return platform_name, platform_error(platform_name, str(e), "rejected", e.retry_after)
+    except Exception as e:
+        return platform_name, platform_error(platform_name, str(e), "error", getattr(e, "retry_after", None))
+    if result.status == "circuit_open":
+        result.metadata["retry_after"] = retry_after_seconds(platform.circuit_breaker.retry_after)
+    return platform_name, result.with_results() if include_results else result
+
+def search_all_summary(outcomes: List[Any], platforms_searched: int) -> Dict[str, Any]:
+    responses = [outcome for outcome in outcomes if isinstance(outcome, TenderResponse)]
+    return {
+        "platforms_searched": platforms_searched,
+        "successful": len(responses),
+        "total_results": sum(response.total_count for response in responses)
+    }
+
+async def stream_search_all(searches: List[Awaitable[Tuple[str, Any]]]) -> AsyncIterator[bytes]:
+    """One NDJSON line per platform as soon as it finishes, then a summary line"""
+    start_time = time.time()
+    tasks = [asyncio.ensure_future(search) for search in searches]
+    outcomes = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            platform_name, outcome = await next_done
+            outcomes.append(outcome)
+            status = outcome.status if isinstance(outcome, TenderResponse) else outcome["status"]
+            line = {"type": "platform", "platform": platform_name, "status": status}
+            retry_after = outcome_retry_after(outcome)
+            if retry_after is not None:
+                line["retry_after"] = retry_after
+            yield ndjson_line({**line, "data": outcome})
+        yield ndjson_line({
+            "type": "summary",
+            **search_all_summary(outcomes, len(tasks)),
+            "execution_time": round(time.time() - start_time, 3)
+        })
+    finally:
+        # Client went away - stop waiting on the remaining platforms
+        for task in tasks:
+            task.cancel()
+
+# Registered before /search/{platform_name}, which would otherwise match "all"
+@app.post("/search/all")
+async def search_all_platforms(search_requests: Dict[str, Dict[str, Any]], include_results: bool = False,
+                               deadline: Optional[float] = Query(None, gt=0), stream: bool = False):
+    """
+    Search multiple platforms simultaneously
+    
+    Each platform gets `deadline` seconds (SEARCH_ALL_DEADLINE by default);
+    a platform that misses it is reported with status "timeout" instead of
+    holding up the others. With stream=true the response is NDJSON: one
+    {"type": "platform", ...} line per platform in completion order, then a
+    {"type": "summary", ...} line.
+    """
+    
+    if not search_requests:
+        raise HTTPException(status_code=400, detail="No search requests provided")
+    
+    deadline = deadline or config.SEARCH_ALL_DEADLINE
+    
+    # Prepare searches
+    searches = []
+    for platform_name, params in search_requests.items():
+        if platform_name not in REGISTERED_PLATFORMS:
+            continue
+        
+        try:
+            platform = get_platform(platform_name)
+            searches.append(search_with_deadline(platform_name, platform, params, deadline, include_results))
+        except Exception as e:
+            # Skip problematic platforms
+            continue
+    
+    if not searches:
+        raise HTTPException(status_code=400, detail="No valid search requests")
+    
+    if stream:
+        return StreamingResponse(stream_search_all(searches), media_type=NDJSON_MEDIA_TYPE)
+    
+    # Execute concurrently - each search is bounded by the deadline
+    completed = await asyncio.gather(*searches)
+    
+    return FastJSONResponse({
+        "search_results": dict(completed),
+        "summary": search_all_summary([outcome for _, outcome in completed], len(searches))
+    })
+
 @app.post("/search/{platform_name}")
-async def search_platform(platform_name: str, search_params: Dict[str, Any]):
-    """Dynamic endpoint for any registered platform with automatic result storage"""
+async def search_platform(platform_name: str, search_params: Dict[str, Any], bypass_cache: bool = False,
+                          stale_while_revalidate: Optional[bool] = None, include_results: bool = False):
+    """
+    Dynamic endpoint for any registered platform with automatic result storage
+    
+    Set include_results=true to also receive the legacy `results` list of dicts
+    (the same data as `tenders`, so the payload roughly doubles).
+    """
     start_time = time.time()
     
     try:
         platform = get_platform(platform_name)
-        result = await platform.search(**search_params)
+        result = await platform.run_search(
+            bypass_cache=bypass_cache,
+            stale_while_revalidate=stale_while_revalidate,
+            **search_params
+        )
         
         # Calculate execution time
         execution_time = time.time() - start_time
         
-        # Save results to Supabase (async, don't block response)
-        asyncio.create_task(save_tender_results(
-            platform_name=platform_name,
-            search_params=search_params,
-            results=result,
-            execution_time=execution_time
-        ))
+        # Save results to Supabase (async, don't block response) - cache hits are already stored
+        if not result.metadata.get('cache', {}).get('hit'):
+            asyncio.create_task(save_tender_results(
+                platform_name=platform_name,
+                search_params=search_params,
+                results=result,
+                execution_time=execution_time
+            ))
         
         # Add metadata to response
         result.metadata = getattr(result, 'metadata', {})
@@ -240,7 +414,15 @@ async def search_platform(platform_name: str, search_params: Dict[str, Any]):
             'supabase_connected': get_supabase().is_connected()
         })
         
-        return result
+        if include_results:
+            result.with_results()
+        return FastJSONResponse(result)
+        
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors()))
+        
+    except BulkheadFullError:
+        raise
         
     except ValueError as e:
         # Log failed search
@@ -264,68 +446,19 @@ async def search_platform(platform_name: str, search_params: Dict[str, Any]):
         ))
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/search/all")
-async def search_all_platforms(search_requests: Dict[str, Dict[str, Any]]):
-    """Search multiple platforms simultaneously"""
-    
-    if not search_requests:
-        raise HTTPException(status_code=400, detail="No search requests provided")
-    
-    # Prepare tasks
-    tasks = []
-    for platform_name, params in search_requests.items():
-        if platform_name not in REGISTERED_PLATFORMS:
-            continue
-        
-        try:
-            platform = get_platform(platform_name)
-            tasks.append((platform_name, platform.search(**params)))
-        except Exception as e:
-            # Skip problematic platforms
-            continue
-    
-    if not tasks:
-        raise HTTPException(status_code=400, detail="No valid search requests")
-    
-    # Execute concurrently
-    results = {}
-    completed_tasks = await asyncio.gather(
-        *[task[1] for task in tasks], 
-        return_exceptions=True
-    )
-    
-    for i, (platform_name, _) in enumerate(tasks):
-        result = completed_tasks[i]
-        if isinstance(result, Exception):
-            results[platform_name] = {
-                "error": str(result),
-                "platform": platform_name,
-                "status": "error"
-            }
-        else:
-            results[platform_name] = result
-    
-    return {
-        "search_results": results,
-        "summary": {
-            "platforms_searched": len(tasks),
-            "successful": len([r for r in completed_tasks if not isinstance(r, Exception)]),
-            "total_results": sum([
-                r.total_count for r in completed_tasks 
-                if not isinstance(r, Exception)
-            ])
-        }
-    }
-
 @app.get("/health")
 async def health_check():
     """Health check for all platforms"""
     platform_status = {}
+    circuit_status = {}
+    bulkhead_status = {}
     
     for name, platform_class in REGISTERED_PLATFORMS.items():
         try:
             instance = platform_class()
             auth_req = instance.get_auth_requirements()
+            circuit_status[name] = instance.circuit_breaker.snapshot()
+            bulkhead_status[name] = instance.bulkhead.snapshot()
             
             if auth_req.get("required"):
                 # Check if auth is configured
@@ -341,9 +474,15 @@ async def health_check():
         except Exception as e:
             platform_status[name] = f"error: {str(e)}"
     
+    open_circuits = [name for name, circuit in circuit_status.items() if circuit["state"] == "open"]
+    
     return {
-        "status": "healthy",
+        "status": "degraded" if open_circuits else "healthy",
         "platforms": platform_status,
+        "circuit_breakers": circuit_status,
+        "bulkheads": bulkhead_status,
+        "cache": response_cache.stats(),
+        "parsing_pool": parsing_pool.stats(),
         "registered_platforms": len(REGISTERED_PLATFORMS)
     }
 
@@ -352,27 +491,70 @@ async def health_check():
 async def quick_ted_search(
     query: Optional[str] = None,
     country: Optional[str] = None,
-    limit: int = 10
+    limit: int = 10,
+    include_results: bool = False
 ):
     """Quick TED search with GET params"""
     platform = get_platform("ted")
-    return await platform.search(query=query, country=country, limit=limit)
+    result = await platform.run_search(query=query, country=country, limit=limit)
+    return FastJSONResponse(result.with_results() if include_results else result)
 
 @app.get("/quick/sam")
 async def quick_sam_search(
     posted_from: str,
     posted_to: str,
     dept_name: Optional[str] = None,
-    limit: int = 10
+    limit: int = 10,
+    include_results: bool = False
 ):
     """Quick SAM search with GET params"""
     platform = get_platform("sam")
-    return await platform.search(
+    result = await platform.run_search(
         posted_from=posted_from,
         posted_to=posted_to,
         dept_name=dept_name,
         limit=limit
     )
+    return FastJSONResponse(result.with_results() if include_results else result)
+
+STREAM_MAX_RECORDS = TypeAdapter(Optional[Annotated[int, Field(ge=1)]])
+
+@app.post("/stream/{platform_name}")
+async def stream_platform(platform_name: str, search_params: Dict[str, Any],
+                          max_records: Optional[int] = Query(None, ge=1)):
+    """Stream matching tenders as NDJSON chunks while the platform produces them"""
+    try:
+        platform = get_platform(platform_name)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    search_params = dict(search_params)
+    body_max_records = search_params.pop("max_records", None)
+    request_model = platform.get_search_request_model()
+    if max_records is None:
+        # Same bound as the query parameter
+        try:
+            max_records = STREAM_MAX_RECORDS.validate_python(body_max_records)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=jsonable_encoder(
+                [{**error, "loc": ["body", "max_records"]} for error in e.errors()]))
+    try:
+        if request_model:
+            request_model(**search_params)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors()))
+    
+    # Fail before the 200 goes out while the platform is known to be down
+    breaker = platform.circuit_breaker
+    if breaker.state == CircuitState.OPEN:
+        retry_after = retry_after_seconds(breaker.retry_after)
+        raise HTTPException(status_code=503, detail=f"{platform.platform_name} is unavailable (circuit open)",
+                            headers={"Retry-After": str(retry_after)})
+    
+    return StreamingResponse(
+        ndjson_stream(platform.platform_name, platform.run_stream(max_records=max_records, **search_params)),
+        media_type=NDJSON_MEDIA_TYPE
+    )
 
 # Supabase Testing and Database Endpoints
 @app.get("/database/status")
@@ -436,7 +618,7 @@ async def get_stored_tenders(
             offset=offset
         )
         
-        return {
+        return FastJSONResponse({
             "tenders": tenders,
             "count": len(tenders),
             "platform_filter": platform,
@@ -444,7 +626,7 @@ async def get_stored_tenders(
                 "limit": limit,
                 "offset": offset
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -529,7 +711,8 @@ async def get_search_logs(limit: int = 50):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/latest-tenders")
-async def get_latest_tenders(limit: int = 10):
+async def get_latest_tenders(limit: int = 10, bypass_cache: bool = False,
+                             stale_while_revalidate: Optional[bool] = None):
     """Get latest tenders from all platforms without search criteria"""
     start_time = time.time()
     
@@ -561,28 +744,33 @@ async def get_latest_tenders(limit: int = 10):
         for platform_name, params in platform_params.items():
             try:
                 platform = get_platform(platform_name)
-                result = await platform.search(**params)
+                result = await platform.run_search(
+                    bypass_cache=bypass_cache,
+                    stale_while_revalidate=stale_while_revalidate,
+                    **params
+                )
                 
                 # Store results
                 results[platform_name] = {
                     "status": "success",
                     "total_count": result.total_count,
-                    "tenders": result.tenders[:limit] if result.tenders else [],
+                    "tenders": result.materialize().tenders[:limit],
                     "platform_info": {
                         "name": result.platform,
                         "search_params": params
                     }
                 }
                 
-                total_tenders += len(result.tenders) if result.tenders else 0
+                total_tenders += len(result.records)
                 
-                # Save to Supabase (async, don't block response)
-                asyncio.create_task(save_tender_results(
-                    platform_name=platform_name,
-                    search_params=params,
-                    results=result,
-                    execution_time=time.time() - start_time
-                ))
+                # Save to Supabase (async, don't block response) - cache hits are already stored
+                if not result.metadata.get('cache', {}).get('hit'):
+                    asyncio.create_task(save_tender_results(
+                        platform_name=platform_name,
+                        search_params=params,
+                        results=result,
+                        execution_time=time.time() - start_time
+                    ))
                 
             except Exception as e:
                 logger.error(f"Error fetching latest tenders from {platform_name}: {e}")
@@ -599,7 +787,7 @@ async def get_latest_tenders(limit: int = 10):
         
         execution_time = time.time() - start_time
         
-        return {
+        return FastJSONResponse({
             "status": "success",
             "message": f"Retrieved latest tenders from {len(platform_params)} platforms",
             "execution_time": round(execution_time, 3),
@@ -618,7 +806,7 @@ async def get_latest_tenders(limit: int = 10):
                     "connected": get_supabase().is_connected()
                 }
             }
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error in get_latest_tenders: {e}")
@@ -3,24 +3,87 @@ Bonfire Platform Implementation
 Government procurement platform used by many US states and municipalities
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 from datetime import date
-import httpx
-from bs4 import BeautifulSoup
+import asyncio
 import re
+import time
 from base.platform import BasePlatform
-from base.models import TenderResponse
+from base.errors import PlatformRequestError
+from base.mapping import FieldMapper
+from base.models import TenderRecord, TenderResponse
+from base.parsing_pool import parsing_pool
 from platforms import register_platform
+from platforms.bonfire_parser import parse_solicitations
+from platforms.bonfire_plans import selector_plans
+from platforms.bonfire_slugs import PortalNotFoundError, dead_portal_reason, slug_resolutions
+from config import config
+
+
+# Common organization name mappings - also the known portals searched by organizations="all"
+ORGANIZATION_SLUGS = {
+    "california": "ca",
+    "new york": "ny",
+    "texas": "tx",
+    "florida": "fl",
+    "illinois": "il",
+    "pennsylvania": "pa",
+    "ohio": "oh",
+    "georgia": "ga",
+    "north carolina": "nc",
+    "michigan": "mi",
+    "los angeles": "losangeles",
+    "san francisco": "sf",
+    "chicago": "chicago",
+    "houston": "houston",
+    "phoenix": "phoenix",
+    "philadelphia": "philadelphia",
+    "san antonio": "sanantonio",
+    "san diego": "sandiego",
+    "dallas": "dallas",
+    "san jose": "sanjose"
+}
+
+
+# Parsed solicitation dicts (bonfire_parser) -> TenderRecord; scraped extras stay in extra
+BONFIRE_MAPPER = FieldMapper(
+    platform="Bonfire",
+    fields={
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "organization": "organization",
+        "posted_date": "posted_date",
+        "response_deadline": "deadline",
+        "status": "status",
+        "type": "type",
+        "url": "platform_url",
+        "estimated_value": "estimated_value"
+    },
+    result_keys={
+        "url": "platform_url",
+        "response_deadline": "deadline"
+    },
+    keep_unmapped=True
+)
 
 
 class BonfireSearchRequest(BaseModel):
-    organization: str = Field(..., description="Organization/agency name to search")
+    organization: Optional[str] = Field(None, description="Organization/agency name to search")
+    organizations: Optional[Union[Literal["all"], List[str]]] = Field(
+        None, description='Organizations to search concurrently, or "all" known portals')
     state: Optional[str] = Field(None, description="State code (e.g., 'CA', 'NY')")
     keywords: Optional[str] = Field(None, description="Keywords to search for")
     status: Optional[str] = Field("open", description="Tender status (open, closed, all)")
     limit: Optional[int] = Field(10, ge=1, le=50, description="Number of results")
     days_back: Optional[int] = Field(30, ge=1, le=365, description="Days to look back")
+    
+    @model_validator(mode="after")
+    def check_organization(self):
+        if not self.organization and not self.organizations:
+            raise ValueError("organization or organizations is required")
+        return self
 
 
 class BonfirePlatform(BasePlatform):
@@ -32,9 +95,22 @@ class BonfirePlatform(BasePlatform):
     def get_base_url(self) -> str:
         return "https://gobonfire.com"
     
+    def get_search_request_model(self) -> type:
+        return BonfireSearchRequest
+    
+    def get_cache_ttl(self) -> float:
+        return self.config.get("cache_ttl", config.CACHE_TTL_BONFIRE)
+    
+    def get_result_cache_ttl(self, result: TenderResponse, cache_ttl: float) -> float:
+        # A batch missing timed-out or failed portals is only kept briefly
+        if result.query_info.get("failed"):
+            return min(cache_ttl, config.CACHE_TTL_BONFIRE_PARTIAL)
+        return cache_ttl
+    
     def get_search_params_schema(self) -> dict:
         return {
-            "organization": {"type": "string", "required": True, "description": "Organization name"},
+            "organization": {"type": "string", "required": False, "description": "Organization name (required unless organizations is set)"},
+            "organizations": {"type": "array", "required": False, "description": 'Organization names searched concurrently, or "all" known portals'},
             "state": {"type": "string", "required": False, "description": "State code"},
             "keywords": {"type": "string", "required": False, "description": "Search keywords"},
             "status": {"type": "string", "required": False, "default": "open", "enum": ["open", "closed", "all"]},
@@ -44,288 +120,180 @@ class BonfirePlatform(BasePlatform):
     
     async def search(self, **kwargs) -> TenderResponse:
         """Search Bonfire platform for procurement opportunities"""
+        portal_info = {}
         try:
             # Validate input
             search_request = BonfireSearchRequest(**kwargs)
+            if search_request.organizations:
+                return await self.search_batch(search_request)
             
-            # Build search URL - Bonfire uses organization-specific subdomains
-            org_slug = self._normalize_organization_name(search_request.organization)
-            search_url = f"https://{org_slug}.gobonfire.com/portal/solicitations"
+            records = await self._search_organization(search_request.organization, search_request, portal_info)
             
-            # Prepare search parameters
-            params = {
-                "status": search_request.status,
-                "limit": search_request.limit
-            }
-            
-            if search_request.keywords:
-                params["search"] = search_request.keywords
+            return TenderResponse.from_records(
+                records,
+                platform=self.platform_name,
+                total_count=len(records),
+                query_info={
+                    "search_params": search_request.dict(exclude_none=True),
+                    **portal_info
+                },
+                metadata=self.get_request_metadata()
+            )
             
-            if search_request.state:
-                params["state"] = search_request.state
+        except PortalNotFoundError as e:
+            # The caller named an organization without a portal - not an upstream failure
+            response = self.create_error_response(f"Bonfire search failed: {str(e)}")
+            response.status = "not_found"
+            response.query_info.update(portal_info)
+            return response
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # First, try to access the organization's portal
-                soup = await self.make_scraping_request(client, search_url)
-                
-                # Parse solicitations from the page
-                results = await self._parse_bonfire_solicitations(soup, search_url, search_request)
-                
-                return TenderResponse(
-                    platform=self.platform_name,
-                    total_count=len(results),
-                    tenders=[],  # Will be populated from results via backward compatibility
-                    results=results,
-                    query_info={
-                        "search_params": search_request.dict(exclude_none=True),
-                        "search_url": search_url,
-                        "organization_slug": org_slug
-                    }
-                )
-                
         except Exception as e:
-            return self.create_error_response(f"Bonfire search failed: {str(e)}")
+            response = self.create_error_response(f"Bonfire search failed: {str(e)}")
+            response.query_info.update(portal_info)
+            return response
     
-    def _normalize_organization_name(self, org_name: str) -> str:
-        """Convert organization name to Bonfire subdomain format"""
-        # Common organization name mappings
-        org_mappings = {
-            "california": "ca",
-            "new york": "ny", 
-            "texas": "tx",
-            "florida": "fl",
-            "illinois": "il",
-            "pennsylvania": "pa",
-            "ohio": "oh",
-            "georgia": "ga",
-            "north carolina": "nc",
-            "michigan": "mi",
-            "los angeles": "losangeles",
-            "san francisco": "sf",
-            "chicago": "chicago",
-            "houston": "houston",
-            "phoenix": "phoenix",
-            "philadelphia": "philadelphia",
-            "san antonio": "sanantonio",
-            "san diego": "sandiego",
-            "dallas": "dallas",
-            "san jose": "sanjose"
+    async def _search_organization(self, organization: str, search_request: BonfireSearchRequest,
+                                   portal_info: Dict[str, Any]) -> List[TenderRecord]:
+        """
+        Scrape one organization's portal
+        
+        portal_info is filled in as the search progresses (search_url,
+        organization_slug, slug_resolution, selector_plan), so callers can
+        report it even when the search fails.
+        
+        Raises:
+            PortalNotFoundError: the slug is known (or found) not to be a live portal
+        """
+        # Build search URL - Bonfire uses organization-specific subdomains
+        org_slug = self._normalize_organization_name(organization)
+        search_url = f"https://{org_slug}.gobonfire.com/portal/solicitations"
+        portal_info.update(search_url=search_url, organization_slug=org_slug)
+        
+        # Prepare search parameters
+        params = {
+            "status": search_request.status,
+            "limit": search_request.limit
         }
         
-        # Normalize the organization name
-        normalized = org_name.lower().strip()
+        if search_request.keywords:
+            params["search"] = search_request.keywords
         
-        # Check if we have a direct mapping
-        if normalized in org_mappings:
-            return org_mappings[normalized]
+        if search_request.state:
+            params["state"] = search_request.state
         
-        # Otherwise, create a slug from the name
-        slug = re.sub(r'[^a-z0-9]+', '', normalized)
-        return slug[:20]  # Limit length
-    
-    async def _parse_bonfire_solicitations(self, soup: BeautifulSoup, base_url: str, 
-                                         search_request: BonfireSearchRequest) -> List[dict]:
-        """Parse solicitations from Bonfire HTML page"""
-        results = []
+        # Known-dead subdomains fail without an upstream request
+        verdict = await slug_resolutions.lookup(org_slug)
+        if verdict is not None:
+            portal_info["slug_resolution"] = {"live": verdict["live"], "reason": verdict["reason"],
+                                              "source": "cache", "checked_at": verdict["checked_at"]}
+            if not verdict["live"]:
+                raise PortalNotFoundError(
+                    f"No Bonfire portal at {org_slug}.gobonfire.com ({verdict['reason']}, cached)")
         
+        # First, try to access the organization's portal
         try:
-            # Look for common Bonfire solicitation containers
-            solicitation_selectors = [
-                '.solicitation-item',
-                '.tender-item', 
-                '.opportunity-item',
-                '.procurement-item',
-                'tr[data-solicitation-id]',
-                '.card.solicitation',
-                '[data-testid="solicitation"]'
-            ]
-            
-            solicitations = []
-            for selector in solicitation_selectors:
-                found = soup.select(selector)
-                if found:
-                    solicitations = found
-                    break
-            
-            # If no specific containers found, look for table rows or list items
-            if not solicitations:
-                solicitations = soup.select('tr:has(td), .list-item, .row')
-            
-            for idx, item in enumerate(solicitations[:search_request.limit]):
-                try:
-                    solicitation = self._extract_solicitation_data(item, base_url, idx)
-                    if solicitation and self._is_relevant_solicitation(solicitation, search_request):
-                        results.append(solicitation)
-                except Exception as e:
-                    # Skip problematic items but continue processing
-                    continue
-            
-            # If we didn't find structured data, create a fallback result
-            if not results:
-                results.append({
-                    "id": f"bonfire_{search_request.organization}_fallback",
-                    "title": f"Bonfire Portal Access - {search_request.organization}",
-                    "description": f"Access to {search_request.organization} procurement portal on Bonfire platform",
-                    "organization": search_request.organization,
-                    "platform_url": base_url,
-                    "status": "portal_access",
-                    "type": "portal_link",
-                    "posted_date": None,
-                    "deadline": None,
-                    "estimated_value": None,
-                    "contact_info": None,
-                    "documents": [],
-                    "categories": ["government", "procurement"],
-                    "metadata": {
-                        "platform": "Bonfire",
-                        "access_type": "portal",
-                        "note": "Direct portal access - manual browsing required"
-                    }
-                })
-            
-        except Exception as e:
-            # Return error info as a result
-            results.append({
-                "id": f"bonfire_error_{search_request.organization}",
-                "title": f"Bonfire Search Error - {search_request.organization}",
-                "description": f"Error accessing Bonfire portal: {str(e)}",
-                "organization": search_request.organization,
-                "status": "error",
-                "error": str(e)
-            })
+            html = await self.fetch_html(self.http_client, search_url)
+        except PlatformRequestError as e:
+            reason = dead_portal_reason(e)
+            if reason is None:
+                portal_info["slug_resolution"] = {"live": None, "reason": "transient_error", "source": "upstream"}
+                raise
+            await slug_resolutions.record(org_slug, live=False, reason=reason)
+            portal_info["slug_resolution"] = {"live": False, "reason": reason, "source": "upstream"}
+            raise PortalNotFoundError(f"No Bonfire portal at {org_slug}.gobonfire.com ({reason})",
+                                      status_code=e.status_code, cause=e)
         
-        return results
-    
-    def _extract_solicitation_data(self, item: BeautifulSoup, base_url: str, index: int) -> dict:
-        """Extract solicitation data from HTML element"""
-        try:
-            # Extract title
-            title_selectors = ['h3', 'h4', '.title', '.name', '.solicitation-title', 'td:first-child']
-            title = self._extract_text_by_selectors(item, title_selectors) or f"Solicitation {index + 1}"
-            
-            # Extract description
-            desc_selectors = ['.description', '.summary', '.details', 'td:nth-child(2)', 'p']
-            description = self._extract_text_by_selectors(item, desc_selectors) or ""
-            
-            # Extract dates
-            date_selectors = ['.date', '.posted', '.deadline', '.due-date', 'td:contains("/")', 'time']
-            posted_date = self._extract_text_by_selectors(item, date_selectors)
-            
-            # Extract links
-            link_elem = item.find('a', href=True)
-            link_url = None
-            if link_elem:
-                href = link_elem['href']
-                if href.startswith('/'):
-                    link_url = base_url + href
-                elif href.startswith('http'):
-                    link_url = href
-            
-            # Extract ID
-            solicitation_id = (
-                item.get('data-solicitation-id') or 
-                item.get('data-id') or 
-                item.get('id') or 
-                f"bonfire_{index}"
-            )
-            
-            # Extract status
-            status_selectors = ['.status', '.state', '.badge']
-            status = self._extract_text_by_selectors(item, status_selectors) or "unknown"
-            
-            return {
-                "id": solicitation_id,
-                "title": self.clean_text(title)[:200],  # Limit title length
-                "description": self.clean_text(description)[:500],  # Limit description
-                "organization": "Bonfire Portal",
-                "posted_date": self._parse_date_string(posted_date),
-                "deadline": None,  # Would need more specific parsing
-                "status": status.lower(),
-                "type": "solicitation",
-                "platform_url": link_url or base_url,
-                "estimated_value": None,
-                "contact_info": None,
-                "documents": [],
-                "categories": ["government", "procurement", "bonfire"],
-                "metadata": {
-                    "platform": "Bonfire",
-                    "extraction_method": "web_scraping",
-                    "raw_html_length": len(str(item))
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "id": f"bonfire_parse_error_{index}",
-                "title": f"Parse Error {index + 1}",
-                "description": f"Failed to parse solicitation: {str(e)}",
-                "status": "parse_error",
-                "error": str(e)
-            }
-    
-    def _extract_text_by_selectors(self, element: BeautifulSoup, selectors: List[str]) -> str:
-        """Try multiple selectors to extract text"""
-        for selector in selectors:
-            try:
-                if ':contains(' in selector:
-                    # Handle pseudo-selectors manually
-                    search_text = selector.split(':contains("')[1].split('")')[0]
-                    found = element.find_all(text=lambda text: search_text in str(text) if text else False)
-                    if found:
-                        return str(found[0]).strip()
-                else:
-                    found = element.select_one(selector)
-                    if found:
-                        return found.get_text(strip=True)
-            except Exception:
-                continue
-        return ""
+        if verdict is None:
+            await slug_resolutions.record(org_slug, live=True, reason="ok")
+            portal_info["slug_resolution"] = {"live": True, "reason": "ok", "source": "upstream"}
+        
+        # Parse solicitations from the page off the event loop, reusing this portal's selector plan
+        plan = selector_plans.get(org_slug)
+        parsed = await parsing_pool.run(parse_solicitations, html, search_url,
+                                        {**search_request.model_dump(), "organization": organization}, plan)
+        await selector_plans.set(org_slug, parsed["plan"])
+        portal_info["selector_plan"] = parsed["plan_status"]
+        
+        return BONFIRE_MAPPER.map_all(parsed["results"])
     
-    def _parse_date_string(self, date_str: str) -> str:
-        """Parse various date formats"""
-        if not date_str:
-            return None
+    async def search_batch(self, search_request: BonfireSearchRequest) -> TenderResponse:
+        """
+        Search several organization portals concurrently and merge the results
         
-        # Clean the date string
-        date_str = self.clean_text(date_str)
+        Each portal is its own host, so the per-host rate limit applies to each
+        one separately; at most BONFIRE_BATCH_CONCURRENCY portals are fetched at
+        once and each gets BONFIRE_ORG_TIMEOUT seconds, so a slow or failing
+        portal only loses its own results. Per-portal outcomes are reported in
+        query_info["organizations"].
+        """
+        if search_request.organizations == "all":
+            organizations = list(ORGANIZATION_SLUGS)
+        else:
+            organizations = search_request.organizations
+        # Names that map to the same portal are fetched once
+        by_slug = {}
+        for organization in organizations:
+            by_slug.setdefault(self._normalize_organization_name(organization), organization)
         
-        # Look for common date patterns
-        date_patterns = [
-            r'\d{1,2}/\d{1,2}/\d{4}',  # MM/DD/YYYY
-            r'\d{4}-\d{2}-\d{2}',      # YYYY-MM-DD
-            r'\d{1,2}-\d{1,2}-\d{4}',  # MM-DD-YYYY
-        ]
+        semaphore = asyncio.Semaphore(config.BONFIRE_BATCH_CONCURRENCY)
+        timeout = config.BONFIRE_ORG_TIMEOUT
         
-        for pattern in date_patterns:
-            match = re.search(pattern, date_str)
-            if match:
-                return match.group()
+        async def search_one(organization: str) -> Tuple[List[TenderRecord], Dict[str, Any]]:
+            status = {"organization": organization}
+            portal_info = {}
+            records = []
+            async with semaphore:
+                start_time = time.monotonic()
+                try:
+                    records = await asyncio.wait_for(
+                        self._search_organization(organization, search_request, portal_info), timeout)
+                    status.update(status="success", count=len(records))
+                except asyncio.TimeoutError:
+                    status.update(status="timeout", error=f"No response within {timeout:g}s")
+                except PortalNotFoundError as e:
+                    status.update(status="not_found", error=str(e))
+                except Exception as e:
+                    status.update(status="error", error=str(e))
+                status.update(portal_info, elapsed=round(time.monotonic() - start_time, 3))
+            for record in records:
+                record.extra.setdefault("metadata", {})["organization"] = organization
+            return records, status
         
-        return date_str[:20]  # Return first 20 chars if no pattern matches
-    
-    def _is_relevant_solicitation(self, solicitation: dict, search_request: BonfireSearchRequest) -> bool:
-        """Check if solicitation matches search criteria"""
-        if not solicitation or solicitation.get('status') == 'parse_error':
-            return False
+        outcomes = await asyncio.gather(*(search_one(organization) for organization in by_slug.values()))
+        records = [record for portal_records, _ in outcomes for record in portal_records]
+        statuses = [status for _, status in outcomes]
+        succeeded = sum(1 for status in statuses if status["status"] == "success")
         
-        # If keywords specified, check if they appear in title or description
-        if search_request.keywords:
-            keywords = search_request.keywords.lower()
-            title = solicitation.get('title', '').lower()
-            description = solicitation.get('description', '').lower()
-            
-            if keywords not in title and keywords not in description:
-                return False
+        if not succeeded:
+            response = self.create_error_response(f"Bonfire batch search failed for all {len(statuses)} organizations")
+            response.query_info["organizations"] = statuses
+            return response
         
-        # Filter by status if specified
-        if search_request.status != "all":
-            sol_status = solicitation.get('status', '').lower()
-            if search_request.status == "open" and sol_status in ['closed', 'expired', 'awarded']:
-                return False
-            elif search_request.status == "closed" and sol_status in ['open', 'active']:
-                return False
+        return TenderResponse.from_records(
+            records,
+            platform=self.platform_name,
+            total_count=len(records),
+            query_info={
+                "search_params": search_request.dict(exclude_none=True),
+                "organizations": statuses,
+                "succeeded": succeeded,
+                "failed": len(statuses) - succeeded
+            },
+            metadata=self.get_request_metadata()
+        )
+    
+    def _normalize_organization_name(self, org_name: str) -> str:
+        """Convert organization name to Bonfire subdomain format"""
+        # Normalize the organization name
+        normalized = org_name.lower().strip()
+        
+        # Check if we have a direct mapping
+        if normalized in ORGANIZATION_SLUGS:
+            return ORGANIZATION_SLUGS[normalized]
         
-        return True
+        # Otherwise, create a slug from the name
+        slug = re.sub(r'[^a-z0-9]+', '', normalized)
+        return slug[:20]  # Limit length
 
 
 # Register the Bonfire platform
@@ -347,8 +315,8 @@ async def test_bonfire_platform():
         print(f"\n🔍 Testing Bonfire search: {search}")
         result = await platform.search(**search)
         print(f"✅ Results: {result.total_count} found")
-        if result.results:
-            print(f"📋 First result: {result.results[0].get('title', 'No title')}")
+        if result.records:
+            print(f"📋 First result: {result.records[0].title}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,393 @@
+"""
+Bonfire portal HTML parsing
+Only the solicitation containers of a portal page are built into a tree
+(SoupStrainer), using lxml when it is installed and html.parser otherwise.
+Functions here are module-level and take/return plain values so they can run
+in the parsing pool (see base/parsing_pool.py).
+"""
+from typing import Any, Dict, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
+import re
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Bonfire solicitation containers, most specific first
+SOLICITATION_SELECTORS: List[str] = [
+    '.solicitation-item',
+    '.tender-item',
+    '.opportunity-item',
+    '.procurement-item',
+    'tr[data-solicitation-id]',
+    '.card.solicitation',
+    '[data-testid="solicitation"]'
+]
+
+# Used when none of the selectors above match
+FALLBACK_SELECTOR = 'tr:has(td), .list-item, .row'
+
+# Field selectors tried in order within each solicitation element
+FIELD_SELECTORS: Dict[str, List[str]] = {
+    "title": ['h3', 'h4', '.title', '.name', '.solicitation-title', 'td:first-child'],
+    "description": ['.description', '.summary', '.details', 'td:nth-child(2)', 'p'],
+    "posted_date": ['.date', '.posted', '.deadline', '.due-date', 'td:contains("/")', 'time'],
+    "status": ['.status', '.state', '.badge']
+}
+
+# MM/DD/YYYY, YYYY-MM-DD, MM-DD-YYYY - tried in this order
+DATE_PATTERNS = [
+    re.compile(r'\d{1,2}/\d{1,2}/\d{4}'),
+    re.compile(r'\d{4}-\d{2}-\d{2}'),
+    re.compile(r'\d{1,2}-\d{1,2}-\d{4}'),
+]
+
+WHITESPACE = re.compile(r'\s+')
+
+# Bump when the selector lists or the plan layout change so persisted plans are discarded
+SELECTOR_PLAN_VERSION = 2
+
+CONTAINER_CLASSES = {
+    "solicitation-item", "tender-item", "opportunity-item", "procurement-item", "list-item", "row"
+}
+
+
+def is_solicitation_container(name: str, attrs: Dict[str, str]) -> bool:
+    """
+    Whether a tag can match SOLICITATION_SELECTORS or FALLBACK_SELECTOR
+
+    Matching tags are kept with their whole subtree; everything else on the
+    page (navigation, scripts, footers) is skipped while parsing.
+    """
+    if name == "tr" or attrs.get("data-testid") == "solicitation":
+        return True
+    classes = attrs.get("class") or ()
+    if isinstance(classes, str):
+        classes = classes.split()
+    return not CONTAINER_CLASSES.isdisjoint(classes) or ("card" in classes and "solicitation" in classes)
+
+
+SOLICITATION_STRAINER = SoupStrainer(is_solicitation_container)
+
+
+def parse_portal_html(html: Union[bytes, str], parser: str = None) -> BeautifulSoup:
+    """Parse only the solicitation containers of a Bonfire portal page"""
+    return BeautifulSoup(html, parser or HTML_PARSER, parse_only=SOLICITATION_STRAINER)
+
+
+def select_solicitations(soup: BeautifulSoup) -> Tuple[Optional[str], list]:
+    """
+    Solicitation elements matched by the first selector that finds any
+    
+    Returns:
+        (selector, elements) - selector is None when nothing matched
+    """
+    for selector in SOLICITATION_SELECTORS:
+        found = soup.select(selector)
+        if found:
+            return selector, found
+    # If no specific containers found, look for table rows or list items
+    found = soup.select(FALLBACK_SELECTOR)
+    return (FALLBACK_SELECTOR if found else None), found
+
+
+def clean_text(text: str) -> str:
+    """Clean scraped text"""
+    if not text:
+        return ""
+    return WHITESPACE.sub(' ', text.strip())
+
+
+def parse_solicitations(html: Union[bytes, str], base_url: str, search_params: Dict[str, Any],
+                        plan: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parse a portal page into solicitation dicts
+
+    Args:
+        html: Page body as fetched
+        base_url: Portal URL, used for relative links and the fallback result
+        search_params: BonfireSearchRequest fields (organization, keywords, status, limit)
+        plan: Selector plan learned from an earlier scrape of the same portal
+
+    Returns:
+        {"results": [...], "plan": selector plan for next time (or None),
+         "plan_status": "hit", "learned", "invalidated" or "none"}
+    """
+    return parse_bonfire_solicitations(parse_portal_html(html), base_url, search_params, plan)
+
+
+def parse_bonfire_solicitations(soup: BeautifulSoup, base_url: str, search_params: Dict[str, Any],
+                                plan: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parse solicitations from Bonfire HTML page
+
+    A selector plan records the container selector that matched on this portal.
+    With a plan the container is found with one selector instead of trying the
+    whole list; fields are always resolved by a single walk of each element.
+    The plan is relearned when its container no longer matches.
+    """
+    results = []
+    organization = search_params["organization"]
+    new_plan = None
+    plan_status = "none"
+    
+    try:
+        solicitations = soup.select(plan["container"]) if plan else []
+        if solicitations:
+            container = plan["container"]
+        else:
+            container, solicitations = select_solicitations(soup)
+        
+        for idx, item in enumerate(solicitations[:search_params["limit"]]):
+            try:
+                solicitation = extract_solicitation_data(item, base_url, idx)
+                if solicitation and is_relevant_solicitation(solicitation, search_params):
+                    results.append(solicitation)
+            except Exception as e:
+                # Skip problematic items but continue processing
+                continue
+        
+        if container:
+            new_plan = {"version": SELECTOR_PLAN_VERSION, "container": container}
+        if plan is None:
+            plan_status = "learned" if new_plan else "none"
+        else:
+            plan_status = "hit" if new_plan == plan else "invalidated"
+        
+        # If we didn't find structured data, create a fallback result
+        if not results:
+            results.append({
+                "id": f"bonfire_{organization}_fallback",
+                "title": f"Bonfire Portal Access - {organization}",
+                "description": f"Access to {organization} procurement portal on Bonfire platform",
+                "organization": organization,
+                "platform_url": base_url,
+                "status": "portal_access",
+                "type": "portal_link",
+                "posted_date": None,
+                "deadline": None,
+                "estimated_value": None,
+                "contact_info": None,
+                "documents": [],
+                "categories": ["government", "procurement"],
+                "metadata": {
+                    "platform": "Bonfire",
+                    "access_type": "portal",
+                    "note": "Direct portal access - manual browsing required"
+                }
+            })
+        
+    except Exception as e:
+        # Return error info as a result
+        results.append({
+            "id": f"bonfire_error_{organization}",
+            "title": f"Bonfire Search Error - {organization}",
+            "description": f"Error accessing Bonfire portal: {str(e)}",
+            "organization": organization,
+            "status": "error",
+            "error": str(e)
+        })
+        new_plan = plan
+    
+    return {"results": results, "plan": new_plan, "plan_status": plan_status}
+
+
+def _compile_field_selector(selector: str) -> Tuple[str, Any]:
+    """Translate one FIELD_SELECTORS entry into a (kind, value) test for the tree walker"""
+    if selector.startswith('.'):
+        return "class", selector[1:]
+    if ':contains("' in selector:
+        # Matches text nodes anywhere in the element, like the original find_all(text=...) lookup
+        return "text", selector.split(':contains("')[1].split('")')[0]
+    if selector == 'td:first-child':
+        return "nth_td", 1
+    if selector.startswith('td:nth-child(') and selector.endswith(')'):
+        return "nth_td", int(selector[len('td:nth-child('):-1])
+    if selector.isalnum():
+        return "tag", selector
+    raise ValueError(f"Unsupported Bonfire field selector: {selector}")
+
+
+def _build_selector_index():
+    """Map tag names, classes and td positions to the (field, priority, selector) they satisfy"""
+    by_tag, by_class, by_nth_td, by_text = {}, {}, {}, []
+    for field, selectors in FIELD_SELECTORS.items():
+        for priority, selector in enumerate(selectors):
+            kind, value = _compile_field_selector(selector)
+            entry = (field, priority, selector)
+            if kind == "tag":
+                by_tag.setdefault(value, []).append(entry)
+            elif kind == "class":
+                by_class.setdefault(value, []).append(entry)
+            elif kind == "nth_td":
+                by_nth_td.setdefault(value, []).append(entry)
+            else:
+                by_text.append((value, entry))
+    return by_tag, by_class, by_nth_td, by_text
+
+
+_TAG_SELECTORS, _CLASS_SELECTORS, _NTH_TD_SELECTORS, _TEXT_SELECTORS = _build_selector_index()
+
+
+def walk_solicitation(item: Tag) -> Tuple[Dict[str, Tuple[int, str, Any]], Optional[Tag]]:
+    """
+    Visit every node below item once and record, per field, the highest-priority
+    selector that matched together with its first match in document order
+    
+    Gives the same answer as trying each field's selectors in order with
+    select_one() / find_all(text=...), without rescanning the subtree per selector.
+    
+    Returns:
+        (fields, link) - fields maps field -> (priority, selector, node);
+        link is the first <a href> (like item.find('a', href=True))
+    """
+    best: Dict[str, Tuple[int, str, Any]] = {}
+    link = None
+    
+    def record(entries, node):
+        for field, priority, selector in entries:
+            current = best.get(field)
+            if current is None or priority < current[0]:
+                best[field] = (priority, selector, node)
+    
+    def visit(parent: Tag):
+        nonlocal link
+        position = 0
+        for node in parent.children:
+            if isinstance(node, Tag):
+                position += 1
+                entries = _TAG_SELECTORS.get(node.name)
+                if entries:
+                    record(entries, node)
+                for class_name in node.get('class') or ():
+                    entries = _CLASS_SELECTORS.get(class_name)
+                    if entries:
+                        record(entries, node)
+                if node.name == 'td':
+                    entries = _NTH_TD_SELECTORS.get(position)
+                    if entries:
+                        record(entries, node)
+                elif node.name == 'a' and link is None and node.get('href') is not None:
+                    link = node
+                visit(node)
+            elif isinstance(node, NavigableString):
+                for search_text, entry in _TEXT_SELECTORS:
+                    if search_text in node:
+                        record((entry,), node)
+    
+    visit(item)
+    return best, link
+
+
+def extract_solicitation_data(item: BeautifulSoup, base_url: str, index: int) -> dict:
+    """Extract solicitation data from HTML element in a single walk of its subtree"""
+    try:
+        fields, link_elem = walk_solicitation(item)
+        texts = {}
+        for field in FIELD_SELECTORS:
+            _, _, node = fields.get(field, (None, None, None))
+            if node is None:
+                texts[field] = ""
+            elif isinstance(node, Tag):
+                texts[field] = node.get_text(strip=True)
+            else:
+                texts[field] = str(node).strip()
+        
+        title = texts["title"] or f"Solicitation {index + 1}"
+        description = texts["description"] or ""
+        posted_date = texts["posted_date"]
+        
+        # Extract links
+        link_url = None
+        if link_elem:
+            href = link_elem['href']
+            if href.startswith('/'):
+                link_url = base_url + href
+            elif href.startswith('http'):
+                link_url = href
+        
+        # Extract ID
+        solicitation_id = (
+            item.get('data-solicitation-id') or 
+            item.get('data-id') or 
+            item.get('id') or 
+            f"bonfire_{index}"
+        )
+        
+        # Extract status
+        status = texts["status"] or "unknown"
+        
+        return {
+            "id": solicitation_id,
+            "title": clean_text(title)[:200],  # Limit title length
+            "description": clean_text(description)[:500],  # Limit description
+            "organization": "Bonfire Portal",
+            "posted_date": parse_date_string(posted_date),
+            "deadline": None,  # Would need more specific parsing
+            "status": status.lower(),
+            "type": "solicitation",
+            "platform_url": link_url or base_url,
+            "estimated_value": None,
+            "contact_info": None,
+            "documents": [],
+            "categories": ["government", "procurement", "bonfire"],
+            "metadata": {
+                "platform": "Bonfire",
+                "extraction_method": "web_scraping",
+                "raw_html_length": len(str(item))
+            }
+        }
+        
+    except Exception as e:
+        return {
+            "id": f"bonfire_parse_error_{index}",
+            "title": f"Parse Error {index + 1}",
+            "description": f"Failed to parse solicitation: {str(e)}",
+            "status": "parse_error",
+            "error": str(e)
+        }
+
+
+def parse_date_string(date_str: str) -> Optional[str]:
+    """Parse various date formats"""
+    if not date_str:
+        return None
+    
+    # Clean the date string
+    date_str = clean_text(date_str)
+    
+    # Look for common date patterns
+    for pattern in DATE_PATTERNS:
+        match = pattern.search(date_str)
+        if match:
+            return match.group()
+    
+    return date_str[:20]  # Return first 20 chars if no pattern matches
+
+
+def is_relevant_solicitation(solicitation: dict, search_params: Dict[str, Any]) -> bool:
+    """Check if solicitation matches search criteria"""
+    if not solicitation or solicitation.get('status') == 'parse_error':
+        return False
+    
+    # If keywords specified, check if they appear in title or description
+    if search_params.get("keywords"):
+        keywords = search_params["keywords"].lower()
+        title = solicitation.get('title', '').lower()
+        description = solicitation.get('description', '').lower()
+        
+        if keywords not in title and keywords not in description:
+            return False
+    
+    # Filter by status if specified
+    status = search_params.get("status")
+    if status != "all":
+        sol_status = solicitation.get('status', '').lower()
+        if status == "open" and sol_status in ['closed', 'expired', 'awarded']:
+            return False
+        elif status == "closed" and sol_status in ['open', 'active']:
+            return False
+    
+    return True
@@ -0,0 +1,79 @@
+"""
+Persisted Bonfire selector plans, one per portal (organization slug)
+Stored as a small JSON file, replaced atomically on every change
+"""
+from typing import Any, Dict, Optional
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from config import config
+from platforms.bonfire_parser import SELECTOR_PLAN_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+class SelectorPlanCache:
+    """
+    Selector plans keyed by organization slug
+
+    Plans are hints: a missing, unreadable or outdated file only means the next
+    scrape of each portal walks the full selector lists again.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or config.BONFIRE_SELECTOR_PLANS_PATH
+        self._plans: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = asyncio.Lock()
+
+    def _read_file(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                plans = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable selector plan file {self.path}: {e}")
+            return {}
+        return {slug: plan for slug, plan in plans.items()
+                if isinstance(plan, dict) and plan.get("version") == SELECTOR_PLAN_VERSION}
+
+    def _write_file(self, plans: Dict[str, Dict[str, Any]]):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".selector-plans-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(plans, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        if self._plans is None:
+            self._plans = self._read_file()
+        return self._plans.get(slug)
+
+    async def set(self, slug: str, plan: Optional[Dict[str, Any]]):
+        """Store (or with plan=None, drop) the plan for a portal and persist it"""
+        if self.get(slug) == plan:
+            return
+        async with self._lock:
+            if plan is None:
+                self._plans.pop(slug, None)
+            else:
+                self._plans[slug] = plan
+            plans = dict(self._plans)
+            try:
+                await asyncio.to_thread(self._write_file, plans)
+            except OSError as e:
+                logger.warning(f"Could not persist selector plans to {self.path}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "portals": len(self._plans or {})}
+
+
+# Global selector plan cache
+selector_plans = SelectorPlanCache()
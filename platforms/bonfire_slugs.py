@@ -0,0 +1,117 @@
+"""
+Cache of Bonfire organization slug resolution
+Remembers which {slug}.gobonfire.com portals are live (long TTL) and which
+404 or have no DNS record (shorter TTL), so a wrong guess costs one upstream
+round trip per TTL instead of one per search
+"""
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import json
+import logging
+import socket
+import time
+import httpx
+from base.disk_cache import DiskCache
+from base.errors import PlatformRequestError
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "there is no portal at this subdomain"
+DEAD_PORTAL_STATUS_CODES = {404, 410}
+# Resolver answers for a name that does not exist (EAI_AGAIN, a resolver hiccup, is not one)
+DNS_NOT_FOUND_ERRNOS = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+# The same answers by message, when the socket.gaierror itself is not chained
+DNS_NOT_FOUND_MESSAGES = ("name or service not known", "nodename nor servname", "no address associated",
+                          "getaddrinfo failed")
+
+
+class PortalNotFoundError(PlatformRequestError):
+    """No Bonfire portal exists for the organization slug (fresh or cached verdict)"""
+
+
+def is_dns_not_found(error: BaseException) -> bool:
+    """Whether a connect error is a lookup for a name that does not exist (walks chained exceptions)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, socket.gaierror):
+            return error.errno in DNS_NOT_FOUND_ERRNOS
+        if any(message in str(error).lower() for message in DNS_NOT_FOUND_MESSAGES):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def dead_portal_reason(error: Exception) -> Optional[str]:
+    """
+    Why a failed portal fetch means the slug does not exist, or None for transient failures
+
+    Only a 404/410 from the portal or a subdomain with no DNS record counts;
+    connect timeouts and refused connections say nothing about the slug.
+    """
+    if not isinstance(error, PlatformRequestError):
+        return None
+    if error.status_code in DEAD_PORTAL_STATUS_CODES:
+        return f"http_{error.status_code}"
+    if isinstance(error.cause, httpx.ConnectTimeout):
+        return None
+    if isinstance(error.cause, httpx.ConnectError) and is_dns_not_found(error.cause):
+        return "dns"
+    return None
+
+
+class SlugResolutionCache:
+    """
+    Live/dead verdicts per organization slug
+
+    Kept in memory and in a SQLite file (shared by workers and restarts).
+    Transient failures (5xx, 429, timeouts, refused connections) are never cached.
+    """
+
+    def __init__(self, path: str = None, positive_ttl: float = None, negative_ttl: float = None):
+        self.disk = DiskCache(path=path or config.BONFIRE_SLUG_CACHE_PATH)
+        self.positive_ttl = positive_ttl if positive_ttl is not None else config.BONFIRE_SLUG_POSITIVE_TTL
+        self.negative_ttl = negative_ttl if negative_ttl is not None else config.BONFIRE_SLUG_NEGATIVE_TTL
+        self._memory: Dict[str, Tuple[Dict[str, Any], float]] = {}
+
+    async def lookup(self, slug: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached verdict for a slug
+
+        Returns:
+            {"live": bool, "reason": str, "checked_at": epoch seconds} or None
+        """
+        cached = self._memory.get(slug)
+        if cached and cached[1] > time.time():
+            return cached[0]
+        try:
+            row = await asyncio.to_thread(self.disk.get, slug)
+        except Exception as e:
+            logger.warning(f"Slug cache read failed for {slug}: {e}")
+            return None
+        if row is None:
+            self._memory.pop(slug, None)
+            return None
+        payload, created_at, ttl, _ = row
+        verdict = json.loads(payload)
+        self._memory[slug] = (verdict, created_at + ttl)
+        return verdict
+
+    async def record(self, slug: str, live: bool, reason: str):
+        """Store a verdict (live: positive TTL, dead: negative TTL)"""
+        now = time.time()
+        ttl = self.positive_ttl if live else self.negative_ttl
+        verdict = {"live": live, "reason": reason, "checked_at": round(now)}
+        self._memory[slug] = (verdict, now + ttl)
+        try:
+            await asyncio.to_thread(self.disk.set, slug, json.dumps(verdict), now, ttl, 0)
+        except Exception as e:
+            logger.warning(f"Slug cache write failed for {slug}: {e}")
+
+    def close(self):
+        self.disk.close()
+
+
+# Global slug resolution cache
+slug_resolutions = SlugResolutionCache()
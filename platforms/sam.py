@@ -1,10 +1,15 @@
 from pydantic import BaseModel, Field
-from typing import Optional
-import httpx
+from typing import AsyncIterator, List, Optional, Tuple
+from collections import deque
+from datetime import date, datetime, timedelta
+import asyncio
 import os
 from base.platform import BasePlatform
-from base.models import TenderResponse
+from base.hedging import HedgePolicy
+from base.mapping import OMIT, FieldMapper
+from base.models import TenderRecord, TenderResponse
 from platforms import register_platform
+from config import config
 
 class SAMSearchRequest(BaseModel):
     posted_from: str = Field(..., description="Posted from date (MM/DD/YYYY)")
@@ -14,6 +19,63 @@ class SAMSearchRequest(BaseModel):
     ptype: Optional[str] = Field("o", description="Procurement type (o=solicitation, a=award)")
     limit: Optional[int] = Field(10, ge=1, le=100, description="Number of results")
     offset: Optional[int] = Field(0, ge=0, description="Results offset")
+    sharded: Optional[bool] = Field(False, description="Split the date range into parallel windows and return every record")
+    max_records: Optional[int] = Field(None, ge=1, description="Record cap for sharded searches")
+
+# SAM.gov expects MM/dd/yyyy; ISO dates are accepted as well
+SAM_DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d")
+
+def parse_sam_date(value: str) -> date:
+    for fmt in SAM_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid SAM.gov date: {value}")
+
+def format_sam_date(value: date) -> str:
+    return value.strftime("%m/%d/%Y")
+
+def _award(opp: dict):
+    """Award info, only for opportunities that have one"""
+    if "award" not in opp:
+        return OMIT
+    award = opp["award"]
+    return {
+        "date": award.get("date"),
+        "number": award.get("number"),
+        "amount": award.get("amount"),
+        "awardee": award.get("awardee", {}).get("name")
+    }
+
+# SAM.gov opportunity JSON -> TenderRecord
+SAM_MAPPER = FieldMapper(
+    platform="SAM.gov",
+    fields={
+        "id": "noticeId",
+        "notice_id": "noticeId",
+        "title": "title",
+        "organization": "department",
+        "posted_date": "postedDate",
+        "response_deadline": "responseDeadLine",
+        "type": "type",
+        "url": lambda opp: f"https://sam.gov/opp/{opp.get('noticeId')}"
+    },
+    extra={
+        "solicitation_number": "solicitationNumber",
+        "office": "office",
+        "naics_code": "naicsCode",
+        "set_aside_type": "typeOfSetAsideDescription",
+        "active": "active",
+        "award": _award
+    },
+    result_keys={
+        "organization": "department"
+    }
+)
+
+def _tender_order(tender: TenderRecord) -> tuple:
+    return (tender.posted_date.isoformat() if tender.posted_date else "", tender.id or "")
 
 class SAMPlatform(BasePlatform):
     """SAM.gov platform implementation"""
@@ -24,6 +86,15 @@ class SAMPlatform(BasePlatform):
     def get_base_url(self) -> str:
         return "https://api.sam.gov"
     
+    def get_search_request_model(self) -> type:
+        return SAMSearchRequest
+    
+    def get_cache_ttl(self) -> float:
+        return self.config.get("cache_ttl", config.CACHE_TTL_SAM)
+    
+    def get_hedge_policy(self) -> HedgePolicy:
+        return HedgePolicy(**({"enabled": config.ENABLE_SAM_HEDGING} | self.config.get("hedge", {})))
+    
     def get_auth_requirements(self) -> dict:
         return {
             "required": True,
@@ -39,11 +110,11 @@ class SAMPlatform(BasePlatform):
             "Accept": "application/json"
         }
     
-    async def search(self, **kwargs) -> TenderResponse:
-        """Search SAM.gov opportunities"""
-        search_request = SAMSearchRequest(**kwargs)
-        
-        # Build parameters
+    def get_search_url(self) -> str:
+        return f"{self.base_url}/prod/opportunities/v2/search"
+    
+    def _build_params(self, search_request: SAMSearchRequest) -> dict:
+        """Build SAM.gov query parameters"""
         params = {
             "limit": search_request.limit,
             "offset": search_request.offset,
@@ -56,55 +127,223 @@ class SAMPlatform(BasePlatform):
             params["deptname"] = search_request.dept_name
         if search_request.naics_code:
             params["naics"] = search_request.naics_code
+        return params
+    
+    async def search(self, **kwargs) -> TenderResponse:
+        """Search SAM.gov opportunities"""
+        search_request = SAMSearchRequest(**kwargs)
+        if search_request.sharded:
+            return await self.search_sharded(**kwargs)
+        params = self._build_params(search_request)
+        url = self.get_search_url()
+        headers = self.get_headers()
+        
+        try:
+            data = await self.make_api_request(self.http_client, url, headers=headers, params=params)
+            
+            return TenderResponse.from_records(
+                SAM_MAPPER.map_all(data.get("opportunitiesData", [])),
+                platform=self.platform_name,
+                total_count=data.get("totalRecords", 0),
+                query_info={
+                    "search_params": search_request.dict(exclude_none=True),
+                    "api_url": url
+                },
+                metadata=self.get_request_metadata()
+            )
+        except Exception as e:
+            return self.create_error_response(str(e))
+    
+    async def iter_search(self, max_records: Optional[int] = None, page_size: int = None,
+                          concurrency: int = None, **kwargs) -> AsyncIterator[TenderRecord]:
+        """
+        Iterate over all opportunities matching a search, past the 100-result page cap
+        
+        The first page provides totalRecords; the remaining offsets are fetched
+        concurrently, at most `concurrency` pages at a time, and opportunities are
+        yielded as their page arrives (not in offset order). Memory stays bounded
+        by the number of pages in flight, however many records match.
         
-        url = f"{self.base_url}/prod/opportunities/v2/search"
+        Args:
+            max_records: Stop after this many opportunities (default: all)
+            page_size: Records per request (default SAM_PAGE_SIZE)
+            concurrency: Pages fetched in parallel (default SAM_PAGE_CONCURRENCY)
+            **kwargs: SAMSearchRequest parameters (limit is ignored, offset is the start)
+        """
+        search_request = SAMSearchRequest(**kwargs)
+        page_size = page_size or config.SAM_PAGE_SIZE
+        concurrency = concurrency or config.SAM_PAGE_CONCURRENCY
+        params = self._build_params(search_request)
+        params["limit"] = page_size
+        url = self.get_search_url()
         headers = self.get_headers()
         
+        async def fetch_page(offset: int) -> dict:
+            return await self.make_api_request(self.http_client, url, headers=headers,
+                                               params={**params, "offset": offset})
+        
+        start = search_request.offset
+        first_page = await fetch_page(start)
+        end = first_page.get("totalRecords", 0)
+        if max_records is not None:
+            end = min(end, start + max_records)
+        remaining = end - start
+        
+        for opp in first_page.get("opportunitiesData", [])[:remaining]:
+            remaining -= 1
+            yield SAM_MAPPER.map(opp)
+        del first_page
+        
+        offsets = iter(range(start + page_size, end, page_size))
+        pending = set()
+        
+        def prefetch():
+            for offset in offsets:
+                pending.add(asyncio.ensure_future(fetch_page(offset)))
+                if len(pending) >= concurrency:
+                    break
+        
+        try:
+            prefetch()
+            while pending and remaining > 0:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                # Keep the pipeline full before handing records to the consumer
+                prefetch()
+                for task in done:
+                    for opp in task.result().get("opportunitiesData", [])[:remaining]:
+                        remaining -= 1
+                        yield SAM_MAPPER.map(opp)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _count_records(self, search_request: SAMSearchRequest, start: date, end: date) -> int:
+        """Number of records posted in [start, end] (one limit=1 request)"""
+        params = self._build_params(search_request)
+        params.update({
+            "limit": 1,
+            "offset": 0,
+            "postedFrom": format_sam_date(start),
+            "postedTo": format_sam_date(end)
+        })
+        data = await self.make_api_request(self.http_client, self.get_search_url(),
+                                           headers=self.get_headers(), params=params)
+        return data.get("totalRecords", 0)
+    
+    async def plan_windows(self, search_request: SAMSearchRequest,
+                           semaphore: asyncio.Semaphore) -> List[Tuple[date, date, int]]:
+        """
+        Split the posted date range into windows sized to the data
+        
+        The range is first cut into SAM_SHARD_MAX_DAYS chunks (the API limit),
+        then any window holding more than SAM_SHARD_MAX_RECORDS records is halved
+        until it fits or spans a single day, so dense periods get smaller windows.
+        
+        Returns:
+            Non-overlapping (start, end, record_count) windows in date order
+        """
+        start = parse_sam_date(search_request.posted_from)
+        end = parse_sam_date(search_request.posted_to)
+        
+        async def split(window_start: date, window_end: date) -> List[Tuple[date, date, int]]:
+            async with semaphore:
+                count = await self._count_records(search_request, window_start, window_end)
+            if count == 0:
+                return []
+            if count <= config.SAM_SHARD_MAX_RECORDS or window_start == window_end:
+                return [(window_start, window_end, count)]
+            middle = window_start + (window_end - window_start) // 2
+            halves = await asyncio.gather(split(window_start, middle),
+                                          split(middle + timedelta(days=1), window_end))
+            return halves[0] + halves[1]
+        
+        chunks = []
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(end, chunk_start + timedelta(days=config.SAM_SHARD_MAX_DAYS - 1))
+            chunks.append(split(chunk_start, chunk_end))
+            chunk_start = chunk_end + timedelta(days=1)
+        
+        return [window for windows in await asyncio.gather(*chunks) for window in windows]
+    
+    async def iter_sharded(self, max_records: Optional[int] = None, concurrency: int = None,
+                           **kwargs) -> AsyncIterator[TenderRecord]:
+        """
+        Iterate over every opportunity in the posted date range using parallel windows
+        
+        Windows from plan_windows() are fetched concurrently (at most
+        `concurrency` windows ahead of the consumer) and yielded in date order.
+        Each window pages serially, so at most `concurrency` SAM.gov requests
+        are in flight. Records repeated across adjacent windows are dropped by noticeId.
+        """
+        search_request = SAMSearchRequest(**kwargs)
+        concurrency = concurrency or config.SAM_SHARD_CONCURRENCY
+        semaphore = asyncio.Semaphore(concurrency)
+        windows = iter(await self.plan_windows(search_request, semaphore))
+        window_params = search_request.model_dump(exclude={"sharded", "max_records", "limit", "offset"})
+        
+        async def fetch_window(window_start: date, window_end: date) -> List[TenderRecord]:
+            params = {**window_params, "posted_from": format_sam_date(window_start),
+                      "posted_to": format_sam_date(window_end)}
+            # One page at a time per window: the shard semaphore is the only fan-out
+            async with semaphore:
+                records = [record async for record in self.iter_search(concurrency=1, **params)]
+            records.sort(key=_tender_order)
+            return records
+        
+        ahead = deque()
+        
+        def prefetch():
+            for window_start, window_end, _ in windows:
+                ahead.append(asyncio.ensure_future(fetch_window(window_start, window_end)))
+                if len(ahead) >= concurrency:
+                    break
+        
+        emitted = 0
+        previous_ids = set()
+        try:
+            prefetch()
+            while ahead:
+                records = await ahead.popleft()
+                prefetch()
+                current_ids = set()
+                for record in records:
+                    notice_id = record.id
+                    if notice_id in previous_ids or notice_id in current_ids:
+                        continue
+                    current_ids.add(notice_id)
+                    yield record
+                    emitted += 1
+                    if max_records is not None and emitted >= max_records:
+                        return
+                previous_ids = current_ids
+        finally:
+            for task in ahead:
+                task.cancel()
+    
+    def stream(self, max_records: Optional[int] = None, **kwargs) -> AsyncIterator[TenderRecord]:
+        """Stream every matching opportunity (date-window shards when sharded=true)"""
+        if kwargs.get("sharded"):
+            return self.iter_sharded(max_records=max_records, **kwargs)
+        return self.iter_search(max_records=max_records, **kwargs)
+    
+    async def search_sharded(self, **kwargs) -> TenderResponse:
+        """Collect a sharded search into a single response"""
+        search_request = SAMSearchRequest(**kwargs)
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                data = await self.make_api_request(client, url, headers=headers, params=params)
-                
-                # Process results
-                results = []
-                if "opportunitiesData" in data:
-                    for opp in data["opportunitiesData"]:
-                        processed_opp = {
-                            "id": opp.get("noticeId"),
-                            "title": opp.get("title"),
-                            "solicitation_number": opp.get("solicitationNumber"),
-                            "department": opp.get("department"),
-                            "office": opp.get("office"),
-                            "posted_date": opp.get("postedDate"),
-                            "response_deadline": opp.get("responseDeadLine"),
-                            "type": opp.get("type"),
-                            "naics_code": opp.get("naicsCode"),
-                            "set_aside_type": opp.get("typeOfSetAsideDescription"),
-                            "active": opp.get("active"),
-                            "url": f"https://sam.gov/opp/{opp.get('noticeId')}"
-                        }
-                        
-                        # Add award info if available
-                        if "award" in opp:
-                            award = opp["award"]
-                            processed_opp["award"] = {
-                                "date": award.get("date"),
-                                "number": award.get("number"),
-                                "amount": award.get("amount"),
-                                "awardee": award.get("awardee", {}).get("name")
-                            }
-                        
-                        results.append(processed_opp)
-                
-                return TenderResponse(
-                    platform=self.platform_name,
-                    total_count=data.get("totalRecords", 0),
-                    tenders=[],  # Will be populated from results via backward compatibility
-                    results=results,
-                    query_info={
-                        "search_params": search_request.dict(exclude_none=True),
-                        "api_url": url
-                    }
-                )
+            records = [record async for record in self.iter_sharded(**kwargs)]
+            return TenderResponse.from_records(
+                records,
+                platform=self.platform_name,
+                total_count=len(records),
+                query_info={
+                    "search_params": search_request.dict(exclude_none=True),
+                    "api_url": self.get_search_url(),
+                    "sharded": True
+                },
+                metadata=self.get_request_metadata()
+            )
         except Exception as e:
             return self.create_error_response(str(e))
 
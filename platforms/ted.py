@@ -1,10 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from datetime import date
-import httpx
+import asyncio
 from base.platform import BasePlatform
-from base.models import TenderResponse
+from base.hedging import HedgePolicy
+from base.mapping import FieldMapper
+from base.models import TenderRecord, TenderResponse
 from platforms import register_platform
+from config import config
 
 class TEDSearchRequest(BaseModel):
     query: Optional[str] = Field(None, description="Search query text")
@@ -15,6 +18,32 @@ class TEDSearchRequest(BaseModel):
     limit: Optional[int] = Field(10, ge=1, le=100, description="Number of results")
     offset: Optional[int] = Field(0, ge=0, description="Results offset")
 
+# TED notice JSON -> TenderRecord
+TED_MAPPER = FieldMapper(
+    platform="TED Europe",
+    fields={
+        "id": "noticeId",
+        "notice_id": "noticeId",
+        "title": "title",
+        "posted_date": "publicationDate",
+        "response_deadline": "deadline",
+        "organization": "contractingAuthority",
+        "estimated_value": "estimatedValue",
+        "type": "procedureType",
+        "url": lambda notice: f"https://ted.europa.eu/udl?uri=TED:NOTICE:{notice.get('noticeId')}"
+    },
+    extra={
+        "country": "country",
+        "cpv_codes": lambda notice: notice.get("cpvCodes", [])
+    },
+    result_keys={
+        "posted_date": "publication_date",
+        "response_deadline": "deadline",
+        "organization": "contracting_authority",
+        "type": "procedure_type"
+    }
+)
+
 class TEDPlatform(BasePlatform):
     """TED Europe platform implementation"""
     
@@ -24,12 +53,20 @@ class TEDPlatform(BasePlatform):
     def get_base_url(self) -> str:
         return "https://ted.europa.eu/api"
     
-    async def search(self, **kwargs) -> TenderResponse:
-        """Search TED Europe database"""
-        # Convert kwargs to TEDSearchRequest
-        search_request = TEDSearchRequest(**kwargs)
-        
-        # Build API parameters
+    def get_search_request_model(self) -> type:
+        return TEDSearchRequest
+    
+    def get_cache_ttl(self) -> float:
+        return self.config.get("cache_ttl", config.CACHE_TTL_TED)
+    
+    def get_hedge_policy(self) -> HedgePolicy:
+        return HedgePolicy(**({"enabled": config.ENABLE_TED_HEDGING} | self.config.get("hedge", {})))
+    
+    def get_search_url(self) -> str:
+        return f"{self.base_url}/v3/notices/search"
+    
+    def _build_params(self, search_request: TEDSearchRequest) -> dict:
+        """Build TED query parameters"""
         params = {
             "limit": search_request.limit,
             "offset": search_request.offset
@@ -45,43 +82,80 @@ class TEDPlatform(BasePlatform):
             params["dateFrom"] = search_request.publication_date_from.isoformat()
         if search_request.publication_date_to:
             params["dateTo"] = search_request.publication_date_to.isoformat()
-        
-        url = f"{self.base_url}/v3/notices/search"
+        return params
+    
+    async def search(self, **kwargs) -> TenderResponse:
+        """Search TED Europe database"""
+        # Convert kwargs to TEDSearchRequest
+        search_request = TEDSearchRequest(**kwargs)
+        params = self._build_params(search_request)
+        url = self.get_search_url()
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                data = await self.make_api_request(client, url, params=params)
-                
-                # Process results
-                results = []
-                if "results" in data:
-                    for notice in data["results"]:
-                        processed_notice = {
-                            "id": notice.get("noticeId"),
-                            "title": notice.get("title"),
-                            "publication_date": notice.get("publicationDate"),
-                            "deadline": notice.get("deadline"),
-                            "country": notice.get("country"),
-                            "contracting_authority": notice.get("contractingAuthority"),
-                            "cpv_codes": notice.get("cpvCodes", []),
-                            "estimated_value": notice.get("estimatedValue"),
-                            "procedure_type": notice.get("procedureType"),
-                            "url": f"https://ted.europa.eu/udl?uri=TED:NOTICE:{notice.get('noticeId')}"
-                        }
-                        results.append(processed_notice)
-                
-                return TenderResponse(
-                    platform=self.platform_name,
-                    total_count=data.get("totalCount", 0),
-                    tenders=[],  # Will be populated from results via backward compatibility
-                    results=results,
-                    query_info={
-                        "search_params": search_request.dict(exclude_none=True),
-                        "api_url": url
-                    }
-                )
+            data = await self.make_api_request(self.http_client, url, params=params)
+            
+            return TenderResponse.from_records(
+                TED_MAPPER.map_all(data.get("results", [])),
+                platform=self.platform_name,
+                total_count=data.get("totalCount", 0),
+                query_info={
+                    "search_params": search_request.dict(exclude_none=True),
+                    "api_url": url
+                },
+                metadata=self.get_request_metadata()
+            )
         except Exception as e:
             return self.create_error_response(str(e))
+    
+    async def iter_search(self, max_records: Optional[int] = None, page_size: int = None,
+                          **kwargs) -> AsyncIterator[TenderRecord]:
+        """
+        Iterate over all notices matching a search, page by page
+        
+        Pagination is pipelined: the request for page N+1 is sent before the
+        notices of page N are normalized and yielded, so the consumer rarely
+        waits on the network. Only one page is held in memory at a time and the
+        first notice is available after a single request, however many match.
+        
+        Args:
+            max_records: Stop after this many notices (default: all)
+            page_size: Records per request (default TED_PAGE_SIZE)
+            **kwargs: TEDSearchRequest parameters (limit is ignored, offset is the start)
+        """
+        search_request = TEDSearchRequest(**kwargs)
+        page_size = page_size or config.TED_PAGE_SIZE
+        params = self._build_params(search_request)
+        params["limit"] = page_size
+        url = self.get_search_url()
+        
+        async def fetch_page(offset: int) -> dict:
+            return await self.make_api_request(self.http_client, url, params={**params, "offset": offset})
+        
+        offset = search_request.offset
+        remaining = max_records if max_records is not None else float("inf")
+        next_page = asyncio.ensure_future(fetch_page(offset))
+        try:
+            while next_page is not None and remaining > 0:
+                data = await next_page
+                next_page = None
+                notices = data.get("results", [])
+                offset += page_size
+                # A short page or reaching totalCount means this was the last page
+                if len(notices) >= page_size and offset < data.get("totalCount", 0) and remaining > len(notices):
+                    next_page = asyncio.ensure_future(fetch_page(offset))
+                del data
+                for notice in notices:
+                    if remaining <= 0:
+                        break
+                    remaining -= 1
+                    yield TED_MAPPER.map(notice)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+    
+    def stream(self, max_records: Optional[int] = None, **kwargs) -> AsyncIterator[TenderRecord]:
+        """Stream every matching notice (pipelined pagination)"""
+        return self.iter_search(max_records=max_records, **kwargs)
 
 # Register platform
 register_platform("ted", TEDPlatform)
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Shared fixtures for the unit tests
+Run from the repository root:
+    python -m pytest -q
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeClock:
+    """Stands in for the time module of the code under test; only moves on advance()"""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake clock patched into the modules that read time.monotonic()"""
+    fake = FakeClock()
+    for module in ("base.circuit_breaker", "base.retry"):
+        monkeypatch.setattr(f"{module}.time", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def fresh_registries(monkeypatch):
+    """Per-test circuit breakers, bulkheads and retry budgets (they are process-wide)"""
+    from base.bulkhead import bulkheads
+    from base.circuit_breaker import circuit_breakers
+    monkeypatch.setattr(circuit_breakers, "_breakers", {})
+    monkeypatch.setattr(bulkheads, "_bulkheads", {})
+    monkeypatch.setattr("base.retry.retry_budgets", {})
+
+
+@pytest.fixture
+def make_platform():
+    """
+    Build a platform whose upstream is an httpx.MockTransport handler
+
+    The platform's search() makes one make_api_request() call and returns its
+    "items" as tenders. Retries have no backoff and the response cache is off.
+    """
+    import httpx
+    from base.models import TenderResponse
+    from base.platform import BasePlatform
+
+    class FakePlatform(BasePlatform):
+        def __init__(self, handler, **config):
+            self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            super().__init__({"cache_ttl": 0, "retry": {"base_delay": 0, "max_delay": 0}, **config})
+
+        def get_platform_name(self) -> str:
+            return "Fake"
+
+        def get_base_url(self) -> str:
+            return "https://fake.example"
+
+        async def search(self, **kwargs) -> TenderResponse:
+            data = await self.make_api_request(self.client, f"{self.base_url}/search", params=kwargs)
+            return TenderResponse(platform=self.platform_name, total_count=len(data["items"]),
+                                  tenders=data["items"])
+
+    return FakePlatform
@@ -0,0 +1,97 @@
+"""
+Bulkhead slots, queue limits and queue timeouts (base/bulkhead.py)
+"""
+import asyncio
+
+import pytest
+
+from base.bulkhead import Bulkhead
+from base.errors import BulkheadFullError
+
+
+async def hold(bulkhead: Bulkhead, release: asyncio.Event, entered: asyncio.Event = None):
+    async with bulkhead.acquire():
+        if entered is not None:
+            entered.set()
+        await release.wait()
+
+
+def test_queued_call_runs_when_slot_frees():
+    async def scenario():
+        bulkhead = Bulkhead("Fake", max_concurrent=1, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(bulkhead, release))
+        await asyncio.sleep(0)
+        entered, queued_release = asyncio.Event(), asyncio.Event()
+        queued = asyncio.ensure_future(hold(bulkhead, queued_release, entered))
+        await asyncio.sleep(0)
+        snapshot = bulkhead.snapshot()
+        release.set()
+        await holder
+        await entered.wait()
+        active_after = bulkhead.active
+        queued_release.set()
+        await queued
+        return snapshot, active_after, bulkhead
+
+    snapshot, active_after, bulkhead = asyncio.run(scenario())
+
+    assert (snapshot["active"], snapshot["waiting"]) == (1, 1)
+    assert active_after == 1
+    assert (bulkhead.active, bulkhead.waiting, bulkhead.rejected) == (0, 0, 0)
+
+
+def test_full_queue_is_rejected_with_429():
+    async def scenario():
+        bulkhead = Bulkhead("Fake", max_concurrent=1, max_queue=0, queue_timeout=2.5)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(bulkhead, release))
+        await asyncio.sleep(0)
+        with pytest.raises(BulkheadFullError) as error:
+            async with bulkhead.acquire():
+                pass
+        release.set()
+        await holder
+        return error.value, bulkhead
+
+    error, bulkhead = asyncio.run(scenario())
+
+    assert error.status_code == 429
+    assert error.retry_after == 3
+    assert bulkhead.rejected == 1
+    assert bulkhead.active == 0
+
+
+def test_queue_timeout_is_rejected_with_503():
+    async def scenario():
+        bulkhead = Bulkhead("Fake", max_concurrent=1, max_queue=1, queue_timeout=0.01)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(bulkhead, release))
+        await asyncio.sleep(0)
+        with pytest.raises(BulkheadFullError) as error:
+            async with bulkhead.acquire():
+                pass
+        waiting = bulkhead.waiting
+        release.set()
+        await holder
+        return error.value, waiting, bulkhead
+
+    error, waiting, bulkhead = asyncio.run(scenario())
+
+    assert error.status_code == 503
+    assert error.retry_after == 1
+    assert waiting == 0
+    assert bulkhead.rejected == 1
+    assert bulkhead.active == 0
+
+
+def test_slot_released_when_block_raises():
+    async def scenario():
+        bulkhead = Bulkhead("Fake", max_concurrent=1, max_queue=0, queue_timeout=1)
+        with pytest.raises(RuntimeError):
+            async with bulkhead.acquire():
+                raise RuntimeError("upstream failed")
+        async with bulkhead.acquire():
+            return bulkhead.active
+
+    assert asyncio.run(scenario()) == 1
@@ -0,0 +1,120 @@
+"""
+Circuit breaker state transitions (base/circuit_breaker.py, BasePlatform.run_search)
+"""
+import asyncio
+
+import httpx
+
+from base.circuit_breaker import CircuitBreaker, CircuitState
+from base.models import TenderResponse
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("Fake", failure_threshold=3, recovery_timeout=30, half_open_max_calls=1)
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    breaker.record_success()
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure("boom")
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.retry_after == 30
+    assert breaker.snapshot()["last_error"] == "boom"
+
+
+def test_half_open_after_recovery_timeout(clock):
+    breaker = CircuitBreaker("Fake", failure_threshold=1, recovery_timeout=30, half_open_max_calls=1)
+    breaker.record_failure()
+    clock.advance(29.5)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.retry_after == 0.5
+
+    clock.advance(0.5)
+    assert breaker.state == CircuitState.HALF_OPEN
+    # One probe slot: the second caller is still rejected
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_probe_success_closes(clock):
+    breaker = CircuitBreaker("Fake", failure_threshold=1, recovery_timeout=30, half_open_max_calls=1)
+    breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.retry_after == 0
+    assert breaker.allow_request()
+
+
+def test_probe_failure_reopens(clock):
+    breaker = CircuitBreaker("Fake", failure_threshold=1, recovery_timeout=30, half_open_max_calls=1)
+    breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow_request()
+    breaker.record_failure("still down")
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.retry_after == 30
+
+
+def test_release_returns_probe_slot(clock):
+    breaker = CircuitBreaker("Fake", failure_threshold=1, recovery_timeout=30, half_open_max_calls=1)
+    breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_open_circuit_fails_fast_without_upstream_call(clock, make_platform):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(500)
+
+    platform = make_platform(handler, retry={"max_attempts": 1},
+                             circuit_breaker={"failure_threshold": 2, "recovery_timeout": 30})
+
+    async def searches(count):
+        responses = []
+        for _ in range(count):
+            try:
+                responses.append(await platform.run_search(query="x"))
+            except Exception as e:
+                responses.append(e)
+        return responses
+
+    responses = asyncio.run(searches(3))
+
+    assert len(calls) == 2
+    assert platform.circuit_breaker.state == CircuitState.OPEN
+    assert responses[2].status == "circuit_open"
+    assert responses[2].metadata["circuit_breaker"]["retry_after"] == 30
+
+
+def test_search_without_upstream_request_leaves_breaker_alone(clock, make_platform):
+    class CachedVerdictPlatform(make_platform):
+        async def search(self, **kwargs) -> TenderResponse:
+            # Answered from local state (like a Bonfire slug cached as dead)
+            response = self.create_error_response("no portal (cached)")
+            response.status = "not_found"
+            return response
+
+    platform = CachedVerdictPlatform(lambda request: httpx.Response(500),
+                                     circuit_breaker={"failure_threshold": 1, "recovery_timeout": 30})
+    breaker = platform.circuit_breaker
+    breaker.record_failure("upstream down")
+    clock.advance(30)
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    response = asyncio.run(platform.run_search(query="x"))
+
+    assert response.status == "not_found"
+    assert breaker.state == CircuitState.HALF_OPEN
+    # The probe slot went back: the next real request may still probe
+    assert breaker.allow_request()
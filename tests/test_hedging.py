@@ -0,0 +1,71 @@
+"""
+Hedged requests (base/hedging.py, BasePlatform._send_request)
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from base import hedging
+from base.errors import PlatformRequestError
+
+
+@pytest.fixture
+def hedged_platform(monkeypatch, make_platform):
+    """Platform with hedging on and a learned latency of 10ms (hedges fire after min_delay)"""
+    monkeypatch.setattr(hedging, "latency_trackers", {})
+    monkeypatch.setattr(hedging, "hedge_budgets", {})
+    tracker = hedging.get_latency_tracker("Fake")
+    for _ in range(5):
+        tracker.record(0.01)
+
+    def build(handler):
+        return make_platform(handler, retry={"max_attempts": 1},
+                             hedge={"enabled": True, "min_samples": 5, "max_ratio": 1.0, "min_delay": 0.02})
+
+    return build
+
+
+def test_fast_error_from_hedge_does_not_cancel_original(hedged_platform):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"items": []})
+        return httpx.Response(503)
+
+    platform = hedged_platform(handler)
+    data = asyncio.run(platform.make_api_request(platform.client, "https://fake.example/search"))
+
+    assert data == {"items": []}
+    assert len(calls) == 2
+    assert platform.request_stats["hedges"] == 1
+
+
+def test_hedge_wins_when_it_succeeds_first(hedged_platform):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"items": [], "call": len(calls)})
+
+    platform = hedged_platform(handler)
+    data = asyncio.run(platform.make_api_request(platform.client, "https://fake.example/search"))
+
+    assert data == {"items": [], "call": 2}
+
+
+def test_both_attempts_failing_raises_status_error(hedged_platform):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(503)
+
+    platform = hedged_platform(handler)
+    with pytest.raises(PlatformRequestError) as error:
+        asyncio.run(platform.make_api_request(platform.client, "https://fake.example/search"))
+
+    assert error.value.status_code == 503
@@ -0,0 +1,126 @@
+"""
+Retry policy and retry budget accounting (base/retry.py, BasePlatform.make_api_request)
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from base import retry
+from base.errors import PlatformRequestError
+from base.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+
+def counting_handler(responses):
+    """MockTransport handler answering with each response in turn (the last one repeats)"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        response = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return handler, calls
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(" 0 ") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_policy_retries_transient_failures_only():
+    policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+    assert policy.is_retryable(PlatformRequestError("x", status_code=503), idempotent=True)
+    assert not policy.is_retryable(PlatformRequestError("x", status_code=404), idempotent=True)
+    # A POST that reached the server is not repeated, one that never left is
+    assert not policy.is_retryable(PlatformRequestError("x", status_code=503), idempotent=False)
+    assert policy.is_retryable(PlatformRequestError("x", cause=httpx.ConnectError("refused")), idempotent=False)
+
+
+def test_policy_honors_retry_after_and_attempt_limit():
+    policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0, max_retry_after=30)
+    assert policy.next_delay(1, PlatformRequestError("x", status_code=429, retry_after=5)) == 5
+    assert policy.next_delay(1, PlatformRequestError("x", status_code=429, retry_after=60)) is None
+    assert policy.next_delay(2, PlatformRequestError("x", status_code=503)) == 0
+    assert policy.next_delay(3, PlatformRequestError("x", status_code=503)) is None
+
+
+def test_budget_allows_floor_plus_ratio_of_requests(clock):
+    budget = RetryBudget(ratio=0.5, min_retries=1, window=10.0)
+    for _ in range(4):
+        budget.record_request()
+    # 1 + 0.5 * 4 = 3 retries
+    assert [budget.try_acquire() for _ in range(4)] == [True, True, True, False]
+    assert budget.stats() == {"requests": 4, "retries": 3}
+
+
+def test_budget_window_expires_old_events(clock):
+    budget = RetryBudget(ratio=0, min_retries=1, window=10.0)
+    budget.record_request()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    clock.advance(10.5)
+    assert budget.stats() == {"requests": 0, "retries": 0}
+    assert budget.try_acquire()
+
+
+def test_budget_stays_within_window_without_failures(clock):
+    budget = RetryBudget(ratio=0.2, min_retries=1, window=10.0)
+    for _ in range(1000):
+        budget.record_request()
+        clock.advance(0.1)
+    # Only the last window's requests are kept, even though try_acquire() never ran
+    assert len(budget._requests) <= 101
+
+
+def test_request_retries_until_success(make_platform):
+    handler, calls = counting_handler([httpx.Response(503), httpx.Response(503),
+                                       httpx.Response(200, json={"items": []})])
+    platform = make_platform(handler)
+    retry.retry_budgets["Fake"] = RetryBudget(ratio=0, min_retries=5)
+
+    data = asyncio.run(platform.make_api_request(platform.client, "https://fake.example/search"))
+
+    assert data == {"items": []}
+    assert len(calls) == 3
+    assert platform.request_stats["attempts"] == 3
+    assert platform.request_stats["retries"] == 2
+    assert retry.retry_budgets["Fake"].stats() == {"requests": 1, "retries": 2}
+
+
+def test_exhausted_budget_fails_without_retrying(make_platform):
+    handler, calls = counting_handler([httpx.Response(503)])
+    platform = make_platform(handler)
+    retry.retry_budgets["Fake"] = RetryBudget(ratio=0, min_retries=1)
+
+    async def two_requests():
+        errors = []
+        for _ in range(2):
+            with pytest.raises(PlatformRequestError) as error:
+                await platform.make_api_request(platform.client, "https://fake.example/search")
+            errors.append(error.value)
+        return errors
+
+    errors = asyncio.run(two_requests())
+
+    # First request: original + the single budgeted retry; second request: original only
+    assert len(calls) == 3
+    assert [error.status_code for error in errors] == [503, 503]
+    assert platform.request_stats["retries"] == 1
+    assert retry.retry_budgets["Fake"].stats() == {"requests": 2, "retries": 1}
+
+
+def test_non_idempotent_request_is_not_repeated(make_platform):
+    handler, calls = counting_handler([httpx.Response(503)])
+    platform = make_platform(handler)
+
+    with pytest.raises(PlatformRequestError):
+        asyncio.run(platform.make_api_request(platform.client, "https://fake.example/search", method="POST"))
+
+    assert len(calls) == 1
+    assert retry.retry_budgets["Fake"].stats()["retries"] == 0
@@ -0,0 +1,104 @@
+"""
+Single-flight coalescing (base/singleflight.py)
+"""
+import asyncio
+
+import pytest
+
+from base.singleflight import SingleFlight
+
+
+class Upstream:
+    """A call that blocks until released, counting how often it was started"""
+
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return f"result {self.calls}"
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flights, upstream = SingleFlight(), Upstream()
+        callers = [asyncio.ensure_future(flights.do("key", upstream)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert flights.in_flight() == 1
+        upstream.release.set()
+        return await asyncio.gather(*callers), upstream, flights
+
+    results, upstream, flights = asyncio.run(scenario())
+
+    assert upstream.calls == 1
+    assert results == [("result 1", False), ("result 1", True), ("result 1", True)]
+    assert flights.in_flight() == 0
+
+
+def test_cancelled_leader_does_not_cancel_shared_call():
+    async def scenario():
+        flights, upstream = SingleFlight(), Upstream()
+        leader = asyncio.ensure_future(flights.do("key", upstream))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("key", upstream))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        upstream.release.set()
+        return await follower, upstream
+
+    (result, shared), upstream = asyncio.run(scenario())
+
+    assert (result, shared) == ("result 1", True)
+    assert upstream.calls == 1
+    assert not upstream.cancelled
+
+
+def test_call_finishes_after_every_caller_left():
+    async def scenario():
+        flights, upstream = SingleFlight(), Upstream()
+        leader = asyncio.ensure_future(flights.do("key", upstream))
+        await asyncio.sleep(0)
+        task, shared = flights.start("key", upstream)
+        assert shared
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        assert flights.in_flight() == 1
+        upstream.release.set()
+        # The result is still produced (and would be cached by the call itself)
+        return await task, flights
+
+    result, flights = asyncio.run(scenario())
+
+    assert result == "result 1"
+    assert flights.in_flight() == 0
+
+
+def test_failure_reaches_every_caller_and_next_call_starts_fresh():
+    async def failing():
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        flights = SingleFlight()
+        outcomes = await asyncio.gather(flights.do("key", failing), flights.do("key", failing),
+                                        return_exceptions=True)
+        upstream = Upstream()
+        upstream.release.set()
+        return outcomes, await flights.do("key", upstream)
+
+    outcomes, retried = asyncio.run(scenario())
+
+    assert [str(outcome) for outcome in outcomes] == ["upstream down", "upstream down"]
+    assert retried == ("result 1", False)